@@ -1,8 +1,14 @@
 from .exec_command import ExecuteCommandStrategy
 from .api_command import ApiCallStrategy
+from .export_command import ExportCommandStrategy
+from .rotate_command import RotateCommandStrategy
+from .apply_command import ApplyCommandStrategy
 
 # Create a mapping of command names to strategy classes
 COMMAND_STRATEGIES = {
     "exec": ExecuteCommandStrategy,
-    "api": ApiCallStrategy
+    "api": ApiCallStrategy,
+    "export": ExportCommandStrategy,
+    "rotate": RotateCommandStrategy,
+    "apply": ApplyCommandStrategy
 }
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+import sys
+import json
+from .base import PassworkCommand
+
+class ApplyCommandStrategy(PassworkCommand):
+    """
+    Strategy for bringing a vault in line with a desired-state file.
+
+    Prints the plan (+ create, ~ update, - delete) and applies it unless --dry-run is set.
+    """
+    def execute(self, client, args):
+        try:
+            with open(args.file, "r", encoding="utf-8") as file:
+                desired_state = json.load(file)
+
+            plan = client.plan(desired_state)
+            for item in plan["create"]:
+                print(f"+ {item['name']}")
+            for update in plan["update"]:
+                print(f"~ {update['item']['name']}")
+            for delete in plan["delete"]:
+                print(f"- {delete['name']}")
+            print(
+                f"Plan: {len(plan['create'])} to create, {len(plan['update'])} to update, "
+                f"{len(plan['delete'])} to delete, {plan['unchanged']} unchanged"
+            )
+
+            if args.dry_run or not (plan["create"] or plan["update"] or plan["delete"]):
+                return 0
+
+            result = client.apply(plan)
+            # Failed creates are keyed by their index in the plan, updates and deletes by item ID
+            names = {update["id"]: update["item"]["name"] for update in plan["update"]}
+            names.update({delete["id"]: delete["name"] for delete in plan["delete"]})
+            names.update({index: item["name"] for index, item in enumerate(plan["create"])})
+            for key, error in result["failed"].items():
+                print(f"Error: {names[key]}: {error}", file=sys.stderr)
+            print(
+                f"Applied: {len(result['created'])} created, {len(result['updated'])} updated, "
+                f"{len(result['deleted'])} deleted, {len(result['failed'])} failed"
+            )
+            return 1 if result["failed"] else 0
+
+        except Exception as e:
+            print(f"Error applying desired state: {e}", file=sys.stderr)
+            return 1
@@ -17,4 +17,31 @@ class PassworkCommand(ABC):
         Returns:
             int: Exit code
         """
-        pass 
\ No newline at end of file
+        pass
+
+    def _get_search_params(self, args):
+        """
+        Build search parameters from comma-separated command line values.
+
+        Args:
+            args (Namespace): Command line arguments
+
+        Returns:
+            dict: Parameters for search_items
+
+        Raises:
+            ValueError: If no search criteria are provided
+        """
+        search_params = {}
+        for arg_name, param_name in (("vault_id", "vault_ids"), ("folder_id", "folder_ids"), ("tags", "tags")):
+            value = getattr(args, arg_name, None)
+            if value:
+                values = [item.strip() for item in value.split(',')]
+                values = [item for item in values if item]
+                if values:
+                    search_params[param_name] = values
+
+        if not search_params:
+            raise ValueError("No search criteria provided")
+
+        return search_params
@@ -6,6 +6,9 @@ import json
 import subprocess
 from .base import PassworkCommand
 
+# Vault and folder lists longer than this are searched in concurrent shards
+SEARCH_SHARD_SIZE = 50
+
 class ExecuteCommandStrategy(PassworkCommand):
     """
     Strategy for retrieving passwords and executing a command with them
@@ -175,9 +178,9 @@ class ExecuteCommandStrategy(PassworkCommand):
         if not search_params:
             raise ValueError("No password ID or search criteria provided")
             
-        # Search and decrypt
-        items = client.search_and_decrypt(**search_params)
-        items.extend(client.search_and_decrypt_shortcut(**search_params))
+        # Search and decrypt, large vault and folder lists are searched in concurrent shards
+        items = client.search_and_decrypt(**search_params, shard_size=SEARCH_SHARD_SIZE)
+        items.extend(client.search_and_decrypt_shortcut(**search_params, shard_size=SEARCH_SHARD_SIZE))
         return items
     
     def _sanitize_env_var_name(self, name):
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+import os
+import sys
+from .base import PassworkCommand
+
+class ExportCommandStrategy(PassworkCommand):
+    """
+    Strategy for exporting decrypted passwords to a JSONL or CSV file.
+
+    Passwords are selected by vault ID, folder ID or tags and written page by page,
+    so memory use stays constant regardless of vault size.
+    """
+    def execute(self, client, args):
+        try:
+            search_params = self._get_search_params(args)
+
+            if args.output and args.output != "-":
+                # The export holds decrypted secrets, make it readable by the owner only
+                file_descriptor = os.open(args.output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(file_descriptor, "w", newline="", encoding="utf-8") as output:
+                    count = self._export(client, args, output, search_params)
+            else:
+                count = self._export(client, args, sys.stdout, search_params)
+
+            print(f"Exported {count} passwords", file=sys.stderr)
+            return 0
+
+        except Exception as e:
+            print(f"Error exporting passwords: {e}", file=sys.stderr)
+            return 1
+
+    def _export(self, client, args, output, search_params):
+        return client.export_items(
+            output,
+            format=args.format,
+            attachments_path=args.attachments_dir,
+            page_size=args.page_size,
+            **search_params
+        )
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+import sys
+import json
+from .base import PassworkCommand
+
+class RotateCommandStrategy(PassworkCommand):
+    """
+    Strategy for replacing passwords selected by vault ID, folder ID or tags
+    with newly generated ones.
+
+    Prints a JSON report of rotated, failed and skipped password IDs.
+    """
+    def execute(self, client, args):
+        try:
+            search_params = self._get_search_params(args)
+
+            complexity = {
+                "isDigitsRequired": args.require_digits,
+                "isUppercaseRequired": args.require_uppercase,
+                "isSpecialCharactersRequired": args.require_special,
+            }
+            report = client.rotate_passwords(
+                length=args.length,
+                complexity=complexity,
+                updated_before=args.updated_before,
+                **search_params
+            )
+
+            report["failed"] = {item_id: str(error) for item_id, error in report["failed"].items()}
+            print(json.dumps(report, indent=2))
+            print(
+                f"Rotated {len(report['rotated'])}, failed {len(report['failed'])}, skipped {len(report['skipped'])}",
+                file=sys.stderr
+            )
+            return 1 if report["failed"] else 0
+
+        except Exception as e:
+            print(f"Error rotating passwords: {e}", file=sys.stderr)
+            return 1
@@ -46,6 +46,11 @@ def main():
     pwd_group.add_argument("--folder-id", help="ID(s) of folder(s) to search in (comma-separated for multiple)")
     pwd_group.add_argument("--tags", help="Tag(s) to search for (comma-separated for multiple)")
     cmd_parser.add_argument("--cmd", help="Command to execute")
+    # Persistent cache of decrypted passwords shared between runs
+    cache_group = cmd_parser.add_argument_group("Cache (opt-in)")
+    cache_group.add_argument("--cache-ttl", type=float, help="Cache decrypted passwords and search results for this many seconds")
+    cache_group.add_argument("--cache-path", help="Path of the cache database (default: ~/.cache/passwork/cli-cache.sqlite3)")
+    cache_group.add_argument("--no-cache", action="store_true", help="Disable the cache even if PASSWORK_CACHE_TTL is set")
     
     # 2. API Call mode
     api_parser = subparsers.add_parser("api", help="Make a direct API call to Passwork")
@@ -61,6 +66,58 @@ def main():
     api_parser.add_argument("--params", help="JSON string of parameters to pass to the API call")
     api_parser.add_argument("--field", help="Field to extract from the API response")
     
+    # 3. Export mode
+    export_parser = subparsers.add_parser("export", help="Export decrypted passwords to a JSONL or CSV file")
+    # Common arguments for export command
+    export_parser.add_argument("--host", help="Passwork API host URL")
+    export_parser.add_argument("--token", help="Passwork access token")
+    export_parser.add_argument("--refresh-token", help="Passwork refresh token")
+    export_parser.add_argument("--master-key", help="Passwork master key for decryption")
+    export_parser.add_argument("--no-ssl-verify", action="store_true", help="Disable SSL certificate verification")
+    # Password selection (one of these must be used)
+    export_group = export_parser.add_argument_group("Password selection (at least one required)")
+    export_group.add_argument("--vault-id", help="ID(s) of vault(s) to export (comma-separated for multiple)")
+    export_group.add_argument("--folder-id", help="ID(s) of folder(s) to export (comma-separated for multiple)")
+    export_group.add_argument("--tags", help="Tag(s) of passwords to export (comma-separated for multiple)")
+    # Export specific arguments
+    export_parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="Output format (default: jsonl)")
+    export_parser.add_argument("--output", help="Output file (default: standard output)")
+    export_parser.add_argument("--attachments-dir", help="Directory to save attachments to, one subdirectory per password")
+    export_parser.add_argument("--page-size", type=int, default=100, help="Number of passwords fetched per page (default: 100)")
+
+    # 4. Rotate mode
+    rotate_parser = subparsers.add_parser("rotate", help="Replace passwords with newly generated ones")
+    # Common arguments for rotate command
+    rotate_parser.add_argument("--host", help="Passwork API host URL")
+    rotate_parser.add_argument("--token", help="Passwork access token")
+    rotate_parser.add_argument("--refresh-token", help="Passwork refresh token")
+    rotate_parser.add_argument("--master-key", help="Passwork master key for decryption")
+    rotate_parser.add_argument("--no-ssl-verify", action="store_true", help="Disable SSL certificate verification")
+    # Password selection (one of these must be used)
+    rotate_group = rotate_parser.add_argument_group("Password selection (at least one required)")
+    rotate_group.add_argument("--vault-id", help="ID(s) of vault(s) to rotate passwords in (comma-separated for multiple)")
+    rotate_group.add_argument("--folder-id", help="ID(s) of folder(s) to rotate passwords in (comma-separated for multiple)")
+    rotate_group.add_argument("--tags", help="Tag(s) of passwords to rotate (comma-separated for multiple)")
+    # Password policy
+    policy_group = rotate_parser.add_argument_group("Password policy")
+    policy_group.add_argument("--length", type=int, default=32, help="Length of the new passwords (default: 32)")
+    policy_group.add_argument("--require-digits", action="store_true", help="Require at least one digit")
+    policy_group.add_argument("--require-uppercase", action="store_true", help="Require at least one uppercase letter")
+    policy_group.add_argument("--require-special", action="store_true", help="Require at least one special character")
+    rotate_parser.add_argument("--updated-before", help="Skip passwords updated at or after this ISO timestamp")
+
+    # 5. Apply mode
+    apply_parser = subparsers.add_parser("apply", help="Bring a vault in line with a desired-state file")
+    # Common arguments for apply command
+    apply_parser.add_argument("--host", help="Passwork API host URL")
+    apply_parser.add_argument("--token", help="Passwork access token")
+    apply_parser.add_argument("--refresh-token", help="Passwork refresh token")
+    apply_parser.add_argument("--master-key", help="Passwork master key for decryption")
+    apply_parser.add_argument("--no-ssl-verify", action="store_true", help="Disable SSL certificate verification")
+    # Apply specific arguments
+    apply_parser.add_argument("--file", required=True, help="JSON file with the desired state of the vault")
+    apply_parser.add_argument("--dry-run", action="store_true", help="Only print the plan")
+
     # Parse the arguments, but keep unknown ones as command to execute
     args, remaining = parser.parse_known_args()
     
@@ -86,6 +143,9 @@ def main():
         args.token = get_value_from_args_or_env(args.token, "PASSWORK_TOKEN", required=True)
         args.refresh_token = get_value_from_args_or_env(args.refresh_token, "PASSWORK_REFRESH_TOKEN", required=False)
         args.master_key = get_value_from_args_or_env(args.master_key, "PASSWORK_MASTER_KEY", required=False)
+        if args.command == "exec":
+            args.cache_ttl = get_value_from_args_or_env(args.cache_ttl, "PASSWORK_CACHE_TTL", required=False)
+            args.cache_path = get_value_from_args_or_env(args.cache_path, "PASSWORK_CACHE_PATH", required=False)
         
         # Initialize the client
         client = get_client_from_args(args)
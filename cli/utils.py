@@ -2,6 +2,9 @@
 import os
 import urllib3
 from passwork_client import PassworkClient
+from passwork_client.response_cache import ResponseCache
+
+DEFAULT_CACHE_PATH = os.path.join("~", ".cache", "passwork", "cli-cache.sqlite3")
 
 # Suppress SSL certificate verification warnings globally
 from urllib3.exceptions import InsecureRequestWarning
@@ -19,7 +22,7 @@ def get_client_from_args(args):
     """
     # Create the client with SSL verification option
     verify_ssl = not getattr(args, 'no_ssl_verify', False)
-    client = PassworkClient(args.host, verify_ssl=verify_ssl)
+    client = PassworkClient(args.host, verify_ssl=verify_ssl, response_cache=get_cache_from_args(args))
     
     # Set tokens
     client.set_tokens(args.token, args.refresh_token)
@@ -30,6 +33,26 @@ def get_client_from_args(args):
         
     return client
 
+def get_cache_from_args(args):
+    """
+    Create the persistent response cache if it is enabled by command line arguments.
+
+    The cache is opt-in: it is used when a TTL is given (--cache-ttl or PASSWORK_CACHE_TTL)
+    and --no-cache is not set.
+
+    Args:
+        args (Namespace): Command line arguments
+
+    Returns:
+        ResponseCache: The cache, or None if caching is disabled
+    """
+    cache_ttl = getattr(args, 'cache_ttl', None)
+    if getattr(args, 'no_cache', False) or not cache_ttl:
+        return None
+
+    cache_path = os.path.expanduser(getattr(args, 'cache_path', None) or DEFAULT_CACHE_PATH)
+    return ResponseCache(cache_path, ttl=float(cache_ttl))
+
 def get_value_from_args_or_env(args_value, env_var_name, required=False):
     """
     Get a value from command line arguments or environment variable.
@@ -0,0 +1,86 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+import threading
+
+class BulkJournal:
+    """
+    Append-only checkpoint journal of a bulk job, see PassworkClient.run_bulk.
+
+    Every operation is recorded as pending before it is sent (with the time it was first
+    sent) and as done (with the ID returned by the server) or failed after it, one JSON
+    line per record. Reopening the journal of an interrupted job restores the state of
+    every operation, so a restarted job skips finished work. Records are flushed to disk
+    before the next operation starts.
+
+    The journal stores operation keys, states and item IDs only, never item data.
+    """
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self.job_id = None
+        self.records = {}
+        self.lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A record cut short by a crash, the operation stays in its previous state
+                        continue
+                    if "job" in record:
+                        self.job_id = record["job"]
+                    else:
+                        self.records[record["key"]] = record
+
+        if self.job_id is None:
+            self.job_id = uuid.uuid4().hex
+            self._append({"job": self.job_id})
+
+    def _after_fork(self):
+        self.lock = threading.Lock()
+
+    def _append(self, record: dict):
+        with self.lock:
+            file_descriptor = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            with os.fdopen(file_descriptor, "a") as file:
+                file.write(json.dumps(record) + "\n")
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+
+    def get(self, key: str) -> dict | None:
+        return self.records.get(key)
+
+    def is_done(self, key: str) -> bool:
+        record = self.records.get(key)
+        return record is not None and record["status"] == "done"
+
+    def is_pending(self, key: str) -> bool:
+        """True if the operation was sent but its outcome was never recorded."""
+        record = self.records.get(key)
+        return record is not None and record["status"] == "pending"
+
+    def idempotency_key(self, key: str) -> str:
+        """Idempotency key of an operation, stable across restarts of the same job."""
+        return hashlib.sha256(f"{self.job_id}:{key}".encode()).hexdigest()
+
+    def mark_pending(self, key: str, action: str):
+        # A resent operation keeps the time of its first attempt, which may still complete
+        record = self.records.get(key)
+        sent_at = record["sent_at"] if self.is_pending(key) and "sent_at" in record else time.time()
+        self._record({"key": key, "action": action, "status": "pending", "sent_at": sent_at})
+
+    def mark_done(self, key: str, action: str, item_id: str | None = None):
+        self._record({"key": key, "action": action, "status": "done", "id": item_id})
+
+    def mark_failed(self, key: str, action: str, error: Exception):
+        self._record({"key": key, "action": action, "status": "failed", "error": str(error)})
+
+    def _record(self, record: dict):
+        self._append(record)
+        self.records[record["key"]] = record
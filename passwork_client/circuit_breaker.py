@@ -0,0 +1,89 @@
+import time
+import threading
+import warnings
+from .enums.circuit_state_enum import CircuitState
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single Passwork host.
+
+    The circuit opens after `failure_threshold` consecutive failures (connection errors,
+    timeouts and 5xx responses). While it is open requests to the host are rejected
+    without being sent. After `reset_timeout` seconds the circuit becomes half-open and
+    lets a single probe request through: success closes the circuit, failure opens it again.
+
+    `on_state_change(name, old_state, new_state)` is called on every transition.
+    """
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, on_state_change = None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_state_change = on_state_change
+        self.state = CircuitState.Closed
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.lock = threading.Lock()
+
+    def _after_fork(self):
+        self.lock = threading.Lock()
+        self.probe_in_flight = False
+
+    def _transition(self, state: CircuitState):
+        """Change state and return the (old, new) pair for the hook. Called with the lock held."""
+        old_state = self.state
+        self.state = state
+        if state == CircuitState.Open:
+            self.opened_at = time.monotonic()
+        return (old_state, state) if old_state != state else None
+
+    def _notify(self, change):
+        if change and self.on_state_change:
+            try:
+                self.on_state_change(self.name, *change)
+            except Exception as e:
+                warnings.warn(f"Circuit state change hook failed: {e}")
+
+    def allow(self) -> bool:
+        """Check whether a request may be sent now."""
+        change = None
+        with self.lock:
+            if self.state == CircuitState.Open:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                change = self._transition(CircuitState.HalfOpen)
+
+            if self.state == CircuitState.HalfOpen:
+                if self.probe_in_flight:
+                    allowed = False
+                else:
+                    self.probe_in_flight = True
+                    allowed = True
+            else:
+                allowed = True
+
+        self._notify(change)
+        return allowed
+
+    def release_probe(self):
+        """Let another probe through after one that ended without a verdict on the host."""
+        with self.lock:
+            self.probe_in_flight = False
+
+    def record_success(self):
+        change = None
+        with self.lock:
+            self.failures = 0
+            self.probe_in_flight = False
+            if self.state != CircuitState.Closed:
+                change = self._transition(CircuitState.Closed)
+        self._notify(change)
+
+    def record_failure(self):
+        change = None
+        with self.lock:
+            self.failures += 1
+            self.probe_in_flight = False
+            if self.state == CircuitState.HalfOpen or self.failures >= self.failure_threshold:
+                change = self._transition(CircuitState.Open)
+        self._notify(change)
@@ -182,11 +182,17 @@ def get_hash(str: str, func: str | None = None):
             return hashlib.sha256(str.encode()).hexdigest()
 
 
-def rsa_decrypt(data, private_key):
-    private_key = serialization.load_pem_private_key(
+def load_private_key(private_key: str):
+    """Parse a PEM private key; parsing costs more than a single decryption."""
+    return serialization.load_pem_private_key(
         private_key.encode(),  # Convert to bytes
         password=None
     )
+
+def rsa_decrypt(data, private_key):
+    # Accepts a PEM string or a key parsed with load_private_key
+    if isinstance(private_key, str):
+        private_key = load_private_key(private_key)
     decrypted_data = private_key.decrypt(
         b64decode(data),
         padding_rsa.PKCS1v15()
@@ -0,0 +1,41 @@
+import time
+from .exceptions import PassworkError
+
+class Deadline:
+    """
+    Overall time budget shared by a call and all of its sub-requests.
+
+    A deadline is created once per public call and passed down to every HTTP request
+    the call makes (batches, attachment downloads, token refresh), so the whole
+    operation fails fast once the budget is spent.
+    """
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def coerce(cls, deadline):
+        """Turn a number of seconds, a Deadline or None into a Deadline or None."""
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+        return cls(float(deadline))
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self):
+        """Raise a PassworkError if the deadline has passed."""
+        if self.expired():
+            raise PassworkError(f"Deadline of {self.seconds}s exceeded", "deadline_exceeded")
+
+    def timeout(self, connect_timeout: float | None, read_timeout: float | None):
+        """Cap the client-wide (connect, read) timeouts by the remaining time."""
+        remaining = self.remaining()
+        return (
+            remaining if connect_timeout is None else min(connect_timeout, remaining),
+            remaining if read_timeout is None else min(read_timeout, remaining),
+        )
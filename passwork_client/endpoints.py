@@ -0,0 +1,97 @@
+import time
+import random
+import threading
+
+class Endpoint:
+    """
+    A single Passwork host with its health and latency statistics.
+    """
+    def __init__(self, url: str):
+        self.url = url.rstrip('/')
+        self.latency = None
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.breaker = None
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def __repr__(self):
+        return f"Endpoint({self.url!r}, latency={self.latency}, failures={self.failures})"
+
+class EndpointPool:
+    """
+    Health tracking and selection of Passwork hosts.
+
+    Endpoints are ejected passively: after `failure_threshold` consecutive failures an
+    endpoint is skipped for `ejection_time` seconds. Among the available endpoints the
+    faster of two random picks is used (power of two choices over the moving average of
+    response times), which spreads load while preferring low-latency endpoints.
+    If every endpoint is ejected, the one whose ejection ends first is used.
+
+    `breaker_factory(url)`, when given, creates a circuit breaker for every endpoint.
+    """
+    def __init__(self, hosts: list[str], failure_threshold: int = 3, ejection_time: float = 30.0,
+                 latency_smoothing: float = 0.3, breaker_factory = None):
+        self.endpoints = [Endpoint(host) for host in hosts]
+        if breaker_factory:
+            for endpoint in self.endpoints:
+                endpoint.breaker = breaker_factory(endpoint.url)
+        self.failure_threshold = failure_threshold
+        self.ejection_time = ejection_time
+        self.latency_smoothing = latency_smoothing
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.endpoints)
+
+    def _after_fork(self):
+        self.lock = threading.Lock()
+        for endpoint in self.endpoints:
+            if endpoint.breaker:
+                endpoint.breaker._after_fork()
+
+    def select(self, exclude: list[Endpoint] = ()) -> Endpoint:
+        """Pick the endpoint for the next request, skipping the ones in `exclude`."""
+        if len(self.endpoints) == 1:
+            return self.endpoints[0]
+
+        now = time.monotonic()
+        with self.lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+            if not candidates:
+                candidates = list(self.endpoints)
+
+            available = [endpoint for endpoint in candidates if endpoint.is_available(now)]
+            if not available:
+                return min(candidates, key = lambda endpoint: endpoint.ejected_until)
+            if len(available) == 1:
+                return available[0]
+
+            first, second = random.sample(available, 2)
+            # Endpoints without measurements are preferred so that they get measured
+            return min((first, second), key = lambda endpoint: endpoint.latency or 0.0)
+
+    def record_success(self, endpoint: Endpoint, latency: float):
+        with self.lock:
+            endpoint.failures = 0
+            endpoint.ejected_until = 0.0
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += self.latency_smoothing * (latency - endpoint.latency)
+        if endpoint.breaker:
+            endpoint.breaker.record_success()
+
+    def record_failure(self, endpoint: Endpoint):
+        with self.lock:
+            endpoint.failures += 1
+            if endpoint.failures >= self.failure_threshold:
+                endpoint.ejected_until = time.monotonic() + self.ejection_time
+        if endpoint.breaker:
+            endpoint.breaker.record_failure()
+
+    def release(self, endpoint: Endpoint):
+        """Record a request that ended without telling anything about the endpoint's health."""
+        if endpoint.breaker:
+            endpoint.breaker.release_probe()
@@ -2,8 +2,10 @@
 
 from .link_type_enum import LinkType
 from .link_expiration_time_enum import LinkExpirationTime
+from .circuit_state_enum import CircuitState
 
 __all__ = [
     'LinkType',
-    'LinkExpirationTime'
+    'LinkExpirationTime',
+    'CircuitState'
 ]
\ No newline at end of file
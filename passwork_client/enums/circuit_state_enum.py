@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+class CircuitState(StrEnum):
+    Closed = 'closed'
+    Open = 'open'
+    HalfOpen = 'half_open'
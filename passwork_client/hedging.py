@@ -0,0 +1,140 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class HedgePolicy:
+    """
+    Hedged sending of idempotent requests.
+
+    If no response arrives within `delay` seconds, a duplicate request is sent and the
+    first successful response wins. Requests that lost the race are cancelled if they
+    have not started yet, otherwise their response is closed as soon as it arrives.
+
+    The budget keeps the extra load bounded: every request earns `budget` hedge tokens
+    (0.1 allows at most one hedge per ten requests), up to `max_burst` saved tokens, and
+    each hedge spends one token.
+
+    Requests never wait in the queue of the worker pool: while all `max_workers` workers
+    are busy, requests are sent on the caller's thread without hedging, and no hedge is
+    sent. The hedge delay thereby always measures a request that is actually running.
+    """
+    def __init__(self, delay: float, budget: float = 0.1, max_burst: float = 10.0, max_workers: int = 16):
+        self.delay = delay
+        self.budget = budget
+        self.max_burst = max_burst
+        self.max_workers = max_workers
+        self.tokens = max_burst
+        self.requests = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.busy_workers = 0
+        self.lock = threading.Lock()
+        self.executor = None
+
+    @property
+    def stats(self) -> dict:
+        """Counters of hedged requests."""
+        return {
+            "requests": self.requests,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+        }
+
+    def _after_fork(self):
+        # Worker threads do not survive fork(), start a new pool on demand
+        self.lock = threading.Lock()
+        self.executor = None
+        self.busy_workers = 0
+
+    def _get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers = self.max_workers, thread_name_prefix = "passwork-hedge")
+            return self.executor
+
+    def _record_request(self):
+        with self.lock:
+            self.requests += 1
+            self.tokens = min(self.max_burst, self.tokens + self.budget)
+
+    def _take_token(self) -> bool:
+        with self.lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            self.hedges_sent += 1
+            return True
+
+    def _submit(self, send):
+        """Run `send` in the pool if a worker is idle, otherwise return None."""
+        with self.lock:
+            if self.busy_workers >= self.max_workers:
+                return None
+            self.busy_workers += 1
+
+        def release(future):
+            with self.lock:
+                self.busy_workers -= 1
+
+        # Also called when the request is cancelled before it started
+        future = self._get_executor().submit(send)
+        future.add_done_callback(release)
+        return future
+
+    @staticmethod
+    def _is_success(future) -> bool:
+        return future.exception() is None and future.result().status_code < 500
+
+    @staticmethod
+    def _discard(future):
+        """Cancel a losing request, or close its response once it completes."""
+        if future.cancel():
+            return
+
+        def close(done):
+            if done.exception() is None:
+                done.result().close()
+
+        future.add_done_callback(close)
+
+    def send(self, send):
+        """
+        Run `send` (a callable returning a response) with hedging.
+
+        Returns the first successful response. If every attempt fails, the outcome of
+        the original request is returned or raised.
+        """
+        self._record_request()
+
+        primary = self._submit(send)
+        if primary is None:
+            # Every worker is busy, queueing would only delay the request
+            return send()
+
+        done, _ = wait([primary], timeout = self.delay)
+        if done or not self._take_token():
+            return primary.result()
+
+        hedge = self._submit(send)
+        if hedge is None:
+            # No worker is free for the hedge, give the token back
+            with self.lock:
+                self.tokens += 1
+                self.hedges_sent -= 1
+            return primary.result()
+
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when = FIRST_COMPLETED)
+            winner = next((future for future in done if self._is_success(future)), None)
+            if winner is None:
+                continue
+
+            if winner is hedge:
+                with self.lock:
+                    self.hedges_won += 1
+            for future in (primary, hedge):
+                if future is not winner:
+                    self._discard(future)
+            return winner.result()
+
+        return primary.result()
@@ -0,0 +1,166 @@
+import copy
+import json
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+class _Entry:
+    def __init__(self, value, size: int, expires_at: float, validators: dict | None = None):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.validators = validators or {}
+
+class ItemCache:
+    """
+    In-memory LRU cache of decrypted items.
+
+    Entries live for `ttl` seconds. Once expired, an entry is still served for up to
+    `stale_while_revalidate` seconds while it is refreshed in the background. After that
+    the entry is no longer served, but it is kept until evicted so that it can be
+    revalidated with a conditional request instead of being downloaded and decrypted again.
+    Background refreshes share a pool of `refresh_workers` threads, and an entry that is
+    already being refreshed is not refreshed again.
+    The cache holds at most `max_entries` items and, if set, `max_bytes` of item data
+    (estimated from the JSON size); the least recently used entries are evicted first.
+
+    Values are stored and returned as deep copies, so callers can modify them freely.
+    Note that cached items contain decrypted secrets and live in process memory.
+    """
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1000, max_bytes: int | None = None,
+                 stale_while_revalidate: float = 0.0, refresh_workers: int = 2):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_while_revalidate = stale_while_revalidate
+        self.entries = OrderedDict()
+        self.size = 0
+        self.refresh_workers = refresh_workers
+        self.refreshing = set()
+        self.refresh_executor = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def stats(self) -> dict:
+        """Cache metrics for tuning."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self.entries),
+            "bytes": self.size,
+        }
+
+    def _after_fork(self):
+        # Entries stay warm; background refreshes belong to threads of the parent process
+        self.lock = threading.Lock()
+        self.refreshing = set()
+        self.refresh_executor = None
+
+    def get(self, key: str):
+        """
+        Look up an entry.
+
+        Returns a tuple (value, is_stale). The value is None on a miss; is_stale is True
+        when the entry expired but is still within the stale-while-revalidate window.
+        """
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or now >= entry.expires_at + self.stale_while_revalidate:
+                self.misses += 1
+                return None, False
+
+            self.entries.move_to_end(key)
+            is_stale = now >= entry.expires_at
+            if is_stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            value = entry.value
+
+        return copy.deepcopy(value), is_stale
+
+    def peek(self, key: str):
+        """
+        Return (value, validators) of an entry even if it expired, for revalidation.
+
+        The value is None if the key is not cached; validators always is a dict that
+        can be passed on to ApiClient.call.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None, {}
+            value, validators = entry.value, dict(entry.validators)
+        return copy.deepcopy(value), validators
+
+    def set(self, key: str, value: dict, validators: dict | None = None):
+        size = len(json.dumps(value, default = str))
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        value = copy.deepcopy(value)
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = _Entry(value, size, time.monotonic() + self.ttl, validators)
+            self.size += size
+
+            while len(self.entries) > self.max_entries or (self.max_bytes is not None and self.size > self.max_bytes):
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def touch(self, key: str, validators: dict | None = None):
+        """Mark an entry as fresh again without replacing its value."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.ttl
+                if validators:
+                    entry.validators = dict(validators)
+
+    def invalidate(self, key: str):
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def start_refresh(self, key: str) -> bool:
+        """Claim the background refresh of an entry; False if one is already running."""
+        with self.lock:
+            if key in self.refreshing:
+                return False
+            self.refreshing.add(key)
+            return True
+
+    def finish_refresh(self, key: str):
+        with self.lock:
+            self.refreshing.discard(key)
+
+    def submit_refresh(self, refresh):
+        """Run `refresh` on the shared background refresh pool."""
+        with self.lock:
+            if self.refresh_executor is None:
+                self.refresh_executor = ThreadPoolExecutor(
+                    max_workers = self.refresh_workers, thread_name_prefix = "passwork-refresh"
+                )
+            executor = self.refresh_executor
+        return executor.submit(refresh)
+
+    def _remove(self, key: str):
+        entry = self.entries.pop(key)
+        self.size -= entry.size
@@ -1,8 +1,25 @@
+import os
+import time
+import weakref
+import threading
 import requests
 import base64
 import json
 import copy
+from urllib3.exceptions import NewConnectionError
 from ..exceptions import PassworkError
+from ..deadline import Deadline
+
+# Clients whose transport state must be rebuilt in a forked child process
+_fork_safe_clients = weakref.WeakSet()
+
+def _reset_clients_after_fork():
+    """Reset transport state of every live client in a freshly forked child."""
+    for client in list(_fork_safe_clients):
+        client._reset_after_fork()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_clients_after_fork)
 
 class ApiClient:
     """
@@ -11,8 +28,42 @@ class ApiClient:
     def __init__(self):
         # No variable initialization here
         pass
+
+    def _init_transport(self):
+        """
+        Create the pooled HTTP session and locks used by the transport.
+
+        The client is registered for fork detection: a child process created with
+        fork() gets a fresh connection pool and fresh locks, while tokens, the master key,
+        decrypted user keys and any warm caches are kept as they are.
+        """
+        self.http_session = requests.Session()
+        self.token_lock = threading.RLock()
+        self.pid = os.getpid()
+        _fork_safe_clients.add(self)
+
+    def _reset_after_fork(self):
+        """
+        Drop state that must not be shared with the parent process.
+
+        The parent's pooled sockets are abandoned rather than closed, so the parent
+        can keep using them. Components stored on the client that hold their own
+        locks or worker threads expose an `_after_fork` method, which is called here.
+        """
+        self.http_session = requests.Session()
+        self.token_lock = threading.RLock()
+        self.pid = os.getpid()
+
+        for component in list(vars(self).values()):
+            if hasattr(component, "_after_fork"):
+                component._after_fork()
+
+    def _ensure_fork_safe(self):
+        """Fallback fork detection for platforms without os.register_at_fork."""
+        if self.pid != os.getpid():
+            self._reset_after_fork()
         
-    def call(self, method, endpoint, payload = None, headers = None):
+    def call(self, method, endpoint, payload = None, headers = None, deadline = None, validators = None):
         """
         Public method to send general api requests and handle responses.
         
@@ -21,9 +72,16 @@ class ApiClient:
             endpoint (str): API endpoint path
             payload (dict): Data to send with the request
             headers (dict): Custom headers to include in the request
+            deadline (float | Deadline): Overall time budget in seconds, covering token refresh and retries
+            validators (dict): Cache validators ("etag", "last_modified") of a cached GET response.
+                They are sent as If-None-Match/If-Modified-Since, updated from the response, and
+                {"_not_modified": True} is returned when the server answers 304 Not Modified.
             
         For GET requests, payload is sent as query parameters with arrays formatted as 'param[]'.
         For other request types (POST, PUT, DELETE), payload is sent as JSON in the request body.
+
+        When request coalescing is enabled, concurrent identical GET requests share a single
+        round trip (and the deadline of the request that was sent first).
         """
         if payload is None:
             payload = {}
@@ -33,6 +91,9 @@ class ApiClient:
         # Add custom headers if provided
         if headers:
             kwargs["headers"] = headers
+
+        if validators is not None:
+            kwargs["validators"] = validators
         
         # Process parameters based on HTTP method
         if method.upper() == "GET":
@@ -47,14 +108,22 @@ class ApiClient:
                     processed_params[key] = value
                     
             kwargs["params"] = processed_params
+
+            if self.single_flight and validators is None:
+                key = ("call", endpoint, json.dumps([processed_params, headers], sort_keys = True, default = str))
+                return self.single_flight.do(key, lambda: self._request(method, endpoint, deadline = deadline, **kwargs))
         else:
             # For non-GET requests, send payload as JSON in the body
             kwargs["json"] = payload
         
-        return self._request(method, endpoint, **kwargs)
+        return self._request(method, endpoint, deadline = deadline, **kwargs)
         
     def _process_response(self, response):
         """Process API response and handle errors."""
+        if response.status_code == 304:
+            # Let the caller serve its cached copy
+            return {"_not_modified": True}
+
         data = response.json()
         result = {}
         
@@ -84,11 +153,118 @@ class ApiClient:
         response.raise_for_status()
         return result
         
-    def _request(self, method, endpoint, **kwargs):
+    def _send(self, method, endpoint, deadline = None, **kwargs):
+        """
+        Send a single HTTP request to one of the configured hosts.
+
+        On connection errors the request fails over to the next host while the deadline
+        allows it. Requests other than GET only fail over when the connection could not
+        be established, so they are never sent twice. A timed out request is reported as
+        a PassworkError instead of a requests exception. Hosts with an open circuit are
+        skipped; if every circuit is open the request fails fast with code circuit_open.
+        Errors of the host or the connection count as failures of the host. Timeouts that
+        were shortened to fit the deadline, and exits that say nothing about the host (an
+        expired deadline, KeyboardInterrupt), are not counted; they only release a
+        half-open probe, so that the next request can probe the host again.
+        """
+        self._ensure_fork_safe()
+        tried = []
+        while True:
+            # Checked before a half-open circuit lets this request through as its probe
+            if deadline:
+                deadline.check()
+
+            host = self.endpoints.select(tried)
+            if host.breaker and not host.breaker.allow():
+                tried.append(host)
+                if len(tried) < len(self.endpoints):
+                    continue
+                raise PassworkError(f"Circuit is open for {host.url}", "circuit_open")
+
+            remaining = deadline.remaining() if deadline else None
+            try:
+                return self._send_to_host(host, method, endpoint, deadline, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if self._is_capped_timeout(e, remaining):
+                    # The caller's budget ran out, not the host's time
+                    self.endpoints.release(host)
+                else:
+                    self.endpoints.record_failure(host)
+                tried.append(host)
+                if (len(tried) < len(self.endpoints) and self._can_failover(method, e)
+                        and not (deadline and deadline.expired())):
+                    continue
+
+                if isinstance(e, requests.Timeout):
+                    if deadline and deadline.expired():
+                        raise PassworkError(f"Deadline of {deadline.seconds}s exceeded", "deadline_exceeded") from e
+                    raise PassworkError(f"Request to {host.url}{endpoint} timed out", "request_timeout") from e
+                raise
+            except PassworkError:
+                # The deadline expired before the request was sent
+                self.endpoints.release(host)
+                raise
+            except Exception:
+                self.endpoints.record_failure(host)
+                raise
+            except BaseException:
+                self.endpoints.release(host)
+                raise
+
+    def _is_capped_timeout(self, error, remaining):
+        """Check whether a timeout fired at the deadline's cap rather than at the client-wide timeout."""
+        if not isinstance(error, requests.Timeout) or remaining is None:
+            return False
+        timeout = self.connect_timeout if isinstance(error, requests.ConnectTimeout) else self.read_timeout
+        return timeout is None or remaining < timeout
+
+    def _send_to_host(self, host, method, endpoint, deadline = None, **kwargs):
+        """
+        Send a request to the given host with the client-wide timeouts.
+
+        The timeouts are capped by the remaining time of the deadline. GET requests are
+        hedged when a hedge policy is configured.
+        """
+        url = f"{host.url}{endpoint}"
+        if deadline:
+            deadline.check()
+            kwargs["timeout"] = deadline.timeout(self.connect_timeout, self.read_timeout)
+        else:
+            kwargs["timeout"] = (self.connect_timeout, self.read_timeout)
+
+        started = time.monotonic()
+        if self.hedging and method.upper() == "GET":
+            response = self.hedging.send(lambda: self.http_session.request(method, url, **kwargs))
+        else:
+            response = self.http_session.request(method, url, **kwargs)
+
+        if response.status_code >= 500:
+            self.endpoints.record_failure(host)
+        else:
+            self.endpoints.record_success(host, time.monotonic() - started)
+        return response
+
+    @staticmethod
+    def _can_failover(method, error):
+        """Check whether a failed request can safely be repeated on another host."""
+        if method.upper() == "GET":
+            return True
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def _request(self, method, endpoint, deadline = None, validators = None, **kwargs):
         """Helper method to send HTTP requests and handle responses."""
-        url = f"{self.host}{endpoint}"
+        deadline = Deadline.coerce(deadline)
         if "headers" not in kwargs:
             kwargs["headers"] = {}
+        if validators:
+            # Conditional request, the server answers 304 if the cached copy is still current
+            if validators.get("etag"):
+                kwargs["headers"]["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                kwargs["headers"]["If-Modified-Since"] = validators["last_modified"]
         if self.access_token:
             # Don't overwrite custom auth headers if provided
             if "Authorization" not in kwargs["headers"]:
@@ -102,7 +278,7 @@ class ApiClient:
         
         # For the actual request, add verify parameter
         kwargs["verify"] = verify_ssl
-        response = requests.request(method, url, **kwargs)
+        response = self._send(method, endpoint, deadline, **kwargs)
         result = self._process_response(response)
 
         # Handle token expiration
@@ -110,27 +286,50 @@ class ApiClient:
             # Check if auto refresh is enabled
             if self.auto_refresh:
                 # Auto refresh is enabled, attempt to refresh the token
-                self.update_tokens()
+                self._refresh_expired_token(kwargs["headers"].get("Authorization"), deadline)
                 # Update Authorization header with new token
                 if "Authorization" not in kwargs["headers"] or kwargs["headers"]["Authorization"].startswith("Bearer "):
                     kwargs["headers"]["Authorization"] = f"Bearer {self.access_token}"
                 if self.master_key_hash:
                     kwargs["headers"]["X-Master-Key-Hash"] = self.master_key_hash
-                response = requests.request(method, url, **kwargs)
+                response = self._send(method, endpoint, deadline, **kwargs)
                 result = self._process_response(response)
 
             else:
                 # Auto refresh is disabled
                 raise PassworkError("Access token expired", "token_expired")
+
+        if validators is not None and response.status_code == 200:
+            self._store_validators(response, validators)
             
         return result
+
+    @staticmethod
+    def _store_validators(response, validators):
+        """Remember the cache validators the server sent with a response."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        validators["etag"] = etag if isinstance(etag, str) else None
+        validators["last_modified"] = last_modified if isinstance(last_modified, str) else None
     
     def set_tokens(self, access_token, refresh_token):
         """Set the API access and refresh tokens directly."""
         self.access_token = access_token
         self.refresh_token = refresh_token
         
-    def update_tokens(self):
+    def _refresh_expired_token(self, authorization = None, deadline = None):
+        """
+        Refresh the access token once for all threads that saw it expire.
+
+        A thread that waited on the lock while another thread refreshed the token
+        finds a different access token and reuses it instead of refreshing again.
+        """
+        with self.token_lock:
+            if authorization and authorization != f"Bearer {self.access_token}":
+                return
+            self.update_tokens(deadline)
+
+    def update_tokens(self, deadline = None):
         """Refresh the access token using the refresh token."""
         if not self.refresh_token:
             raise PassworkError("No refresh token available", "no_refresh_token")
@@ -143,18 +342,25 @@ class ApiClient:
         self.access_token = None
         self.refresh_token = None
 
-        url = f"{self.host}/api/v1/sessions/refresh"
         headers = {"Authorization": f"Bearer {current_token}"}
         if hasattr(self, 'master_key_hash') and self.master_key_hash:
             headers["X-Master-Key-Hash"] = self.master_key_hash
 
-        # Use requests directly since we're bypassing the normal API client flow
-        response = requests.post(
-            url,
-            json = {"refreshToken": refresh_token_copy},
-            headers = headers,
-            verify = self.verify_ssl
-        )
+        # Send directly since we're bypassing the normal API client flow
+        try:
+            response = self._send(
+                "POST",
+                "/api/v1/sessions/refresh",
+                Deadline.coerce(deadline),
+                json = {"refreshToken": refresh_token_copy},
+                headers = headers,
+                verify = self.verify_ssl
+            )
+        except PassworkError:
+            # Keep the old tokens so a later call can retry the refresh
+            self.access_token = current_token
+            self.refresh_token = refresh_token_copy
+            raise
 
         # Process the response manually
         if response.status_code != 200:
@@ -1,24 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from ..deadline import Deadline
+from ..exceptions import PassworkError
+
+# Maximum number of sub-requests in one batch request
+BATCH_SIZE = 25
+
 class Batch:
     """
         Batch request method
     """
-    def send_batch(self, requests: list):
+    def send_batch(self, requests: list, deadline = None):
 
-        batch = 25
+        deadline = Deadline.coerce(deadline)
         response = []
 
-        batch_requests = [requests[i:i + batch] for i in range(0, len(requests), batch)]
+        batch_requests = [requests[i:i + BATCH_SIZE] for i in range(0, len(requests), BATCH_SIZE)]
         for batch_request in batch_requests:
-            response.extend(self.batch_request(batch_request))
+            response.extend(self.batch_request(batch_request, deadline))
 
         return response
 
-    def batch_request(self, requests: list):
-        responses = self.call("POST", "/api/v1/batch", {"requests": requests})
-
+    def batch_request(self, requests: list, deadline = None):
         response_data = []
-        for response in responses["responses"]:
+        for response in self.batch_request_responses(requests, deadline):
             if response["statusCode"] == 200:
                 response_data.append(response["body"])
 
-        return response_data
\ No newline at end of file
+        return response_data
+
+    def batch_request_responses(self, requests: list, deadline = None) -> list[dict]:
+        """Send one batch and return all sub-responses, with their statusCode and body, in request order."""
+        responses = self.call("POST", "/api/v1/batch", {"requests": requests}, deadline = deadline)
+        return responses["responses"]
+
+    def send_batch_by_key(self, requests: dict, deadline = None):
+        """
+        Send keyed sub-requests in batches of up to BATCH_SIZE and split the outcome by key.
+
+        Returns a tuple (bodies, errors) of dicts keyed like `requests`; if a batch
+        request itself fails, its error is reported for every key of that batch, as it is
+        for keys the batch response has no sub-response for.
+        """
+        deadline = Deadline.coerce(deadline)
+        keys = list(requests)
+        bodies, errors = {}, {}
+        for batch_keys in [keys[i:i + BATCH_SIZE] for i in range(0, len(keys), BATCH_SIZE)]:
+            try:
+                responses = self.batch_request_responses([requests[key] for key in batch_keys], deadline)
+            except Exception as e:
+                errors.update({key: e for key in batch_keys})
+                continue
+
+            for key in batch_keys[len(responses):]:
+                errors[key] = PassworkError("No response to the batch sub-request", "missing_batch_response")
+            for key, response in zip(batch_keys, responses):
+                if response["statusCode"] == 200:
+                    bodies[key] = response["body"]
+                else:
+                    errors[key] = self.batch_response_error(response)
+        return bodies, errors
+
+    @staticmethod
+    def batch_response_error(response: dict) -> PassworkError:
+        """Build the error of a failed sub-response, formatted like errors of single requests."""
+        body = response.get("body") or {}
+        error_messages = []
+        for err in body.get("errors", []) if isinstance(body, dict) else []:
+            if "field" in err and err['field']:
+                error_messages.append(f"{err['field']} => {err['message']}")
+            else:
+                error_messages.append(f"{err['message']}")
+        return PassworkError(str(error_messages), f"api_error:{response['statusCode']}")
+
+    def _iter_pages(self, ids: list, fetch, page_size: int):
+        """
+        Yield the results of fetch(page) for consecutive pages of ids.
+
+        The next page is fetched in the background while the current one is consumed,
+        so network time overlaps with the caller's processing.
+        """
+        pages = [ids[i:i + page_size] for i in range(0, len(ids), page_size)]
+        if not pages:
+            return
+
+        executor = ThreadPoolExecutor(max_workers = 1)
+        try:
+            future = executor.submit(fetch, pages[0])
+            for next_page in pages[1:]:
+                results = future.result()
+                future = executor.submit(fetch, next_page)
+                yield from results
+            yield from future.result()
+        finally:
+            # Stop prefetching if the caller stops iterating early
+            executor.shutdown(wait = False, cancel_futures = True)
@@ -0,0 +1,99 @@
+import copy
+import requests
+from ..bulk_journal import BulkJournal
+from ..exceptions import PassworkError
+from ..utils import parse_timestamp, item_fingerprint
+
+# Allowed difference between the clocks of the client and the server, in seconds
+CLOCK_SKEW = 300
+
+class Bulk:
+    def run_bulk(self, operations, journal: BulkJournal):
+        """
+        Run create, update and delete operations with a checkpoint journal.
+
+        Each operation is a dict with a unique "key", an "action" ("create", "update"
+        or "delete"), the "item_id" for updates and deletes and the item "data" for
+        creates and updates. Operations the journal records as done are skipped, so an
+        interrupted job can simply be run again with the same journal.
+
+        Creates are sent with an idempotency key. For a create that was sent before the
+        job died but never recorded, the vault is first searched for an item with the same
+        folder, name and managed fields that was created after the create was first sent,
+        which is then taken as the created item. Operations that fail in a way that leaves
+        open whether the server received them (read timeouts, connections dropped after
+        sending) stay pending, so they are looked up the same way when the job is resumed.
+
+        Yields one result per operation: {"key", "action", "id", "status", "error"},
+        where status is "done", "skipped" or "failed".
+        """
+        for operation in operations:
+            key, action = operation["key"], operation["action"]
+
+            if journal.is_done(key):
+                yield {"key": key, "action": action, "id": journal.get(key).get("id"), "status": "skipped", "error": None}
+                continue
+
+            try:
+                item_id = None
+                if action == "create" and journal.is_pending(key):
+                    item_id = self._find_created_item(operation["data"], journal.get(key).get("sent_at"))
+
+                if item_id is None:
+                    journal.mark_pending(key, action)
+                    item_id = self._run_bulk_operation(operation, journal.idempotency_key(key))
+            except Exception as e:
+                if not (journal.is_pending(key) and self._is_ambiguous_failure(e)):
+                    journal.mark_failed(key, action, e)
+                yield {"key": key, "action": action, "id": None, "status": "failed", "error": e}
+                continue
+
+            journal.mark_done(key, action, item_id)
+            yield {"key": key, "action": action, "id": item_id, "status": "done", "error": None}
+
+    def _run_bulk_operation(self, operation: dict, idempotency_key: str):
+        match operation["action"]:
+            case "create":
+                # create_item encrypts the data in place, keep the caller's copy for retries
+                return self.create_item(copy.deepcopy(operation["data"]), idempotency_key = idempotency_key)
+            case "update":
+                self.update_item(operation["item_id"], copy.deepcopy(operation["data"]))
+                return operation["item_id"]
+            case "delete":
+                try:
+                    self.delete_item(operation["item_id"])
+                except PassworkError as e:
+                    # Deleted before the job died
+                    if e.code != "api_error:404":
+                        raise
+                return operation["item_id"]
+            case _:
+                raise PassworkError(f"Unknown bulk action: {operation['action']}", "unknown_bulk_action")
+
+    def _find_created_item(self, item_data: dict, sent_at: float | None) -> str | None:
+        """Look for the item created by an operation whose outcome was not recorded."""
+        if not item_data.get("name") or sent_at is None:
+            return None
+
+        # Not served from the response cache, the item may have been created a moment ago
+        search_results = self.call("GET", "/api/v1/items/search", {"query": item_data["name"], "vaultIds": [item_data["vaultId"]]})
+        for summary in search_results.get("items", []):
+            if summary.get("name") != item_data["name"] or summary.get("folderId") != item_data.get("folderId"):
+                continue
+
+            # Items that predate the job or differ from the operation's data were not created by it
+            item = self._get_item(summary["id"])
+            created_at = parse_timestamp(item.get("createdAt"))
+            if created_at is not None and created_at < sent_at - CLOCK_SKEW:
+                continue
+            if item_fingerprint(item, item_data) == item_fingerprint(item_data, item_data):
+                return item["id"]
+        return None
+
+    def _is_ambiguous_failure(self, error: Exception) -> bool:
+        """Check whether a failed request may have reached the server."""
+        if isinstance(error, PassworkError):
+            return error.code == "request_timeout" and not isinstance(error.__cause__, requests.ConnectTimeout)
+        if isinstance(error, requests.ConnectionError):
+            return not self._can_failover("POST", error)
+        return False
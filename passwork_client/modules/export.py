@@ -0,0 +1,56 @@
+import os
+import csv
+import json
+from ..deadline import Deadline
+from ..exceptions import PassworkError
+
+# Columns of a CSV export; customs are written as a JSON list
+EXPORT_CSV_FIELDS = ["id", "vaultId", "folderId", "name", "login", "password", "url", "description", "tags", "customs"]
+
+# Encrypted copies of decrypted fields are left out of exports
+EXPORT_EXCLUDED_FIELDS = ("passwordEncrypted", "keyEncrypted", "vaultMasterKeyEncrypted")
+
+class Export:
+    def export_items(self, output, format: str = "jsonl", query: str = None, tags: list[str] = None,
+                     color_codes: list[int] = None, url: str = None, vault_ids: list[str] = None,
+                     folder_ids: list[str] = None, attachments_path: str = None, page_size: int = 100,
+                     deadline = None) -> int:
+        """
+        Stream decrypted items matching a search into a JSONL or CSV file.
+
+        Items are fetched and decrypted page by page with iter_search and written as they
+        arrive, so memory use does not grow with the number of items. If `attachments_path`
+        is given, the attachments of each item are saved to `attachments_path/<item ID>/`.
+
+        Args:
+            output: Text file object to write to, opened with newline="" for CSV
+            format (str): "jsonl" or "csv"
+
+        Returns:
+            int: Number of exported items
+        """
+        if format not in ("jsonl", "csv"):
+            raise PassworkError(f"Unsupported export format: {format}", "unsupported_export_format")
+
+        deadline = Deadline.coerce(deadline)
+        writer = None
+        if format == "csv":
+            writer = csv.DictWriter(output, fieldnames = EXPORT_CSV_FIELDS, extrasaction = "ignore")
+            writer.writeheader()
+
+        count = 0
+        items = self.iter_search(query, tags, color_codes, url, vault_ids, folder_ids, page_size, deadline)
+        for item in items:
+            if attachments_path and item.get("attachments"):
+                self.download_item_attachment(item, os.path.join(attachments_path, item["id"]), deadline)
+
+            record = {field: value for field, value in item.items() if field not in EXPORT_EXCLUDED_FIELDS}
+            if writer:
+                record["tags"] = ",".join(record.get("tags") or [])
+                record["customs"] = json.dumps(record["customs"]) if record.get("customs") else ""
+                writer.writerow(record)
+            else:
+                output.write(json.dumps(record) + "\n")
+            count += 1
+
+        return count
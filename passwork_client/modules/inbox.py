@@ -1,40 +1,127 @@
+import os
 from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
 from ..utils import get_encryption_key, decrypt_item, decrypt_and_save_item_attachment
 from ..crypto import rsa_encrypt, rsa_decrypt, encrypt_aes, decrypt_aes
+from ..deadline import Deadline
 
 class Inbox:
     """
     A client for interacting with the Passwork Inbox API.
     All methods in this class are related to inbox management functionality.
     """
-    def get_inbox_item(self, inbox_item_id: str):
-        inbox_item = self.call("GET", f"/api/v1/inbox-items/{inbox_item_id}")
+    def get_inbox_item(self, inbox_item_id: str, deadline = None):
+        inbox_item = self.call("GET", f"/api/v1/inbox-items/{inbox_item_id}", deadline = deadline)
 
         if self.is_encrypt:
-            vault_password = rsa_decrypt(inbox_item["inbox"]["keyEncrypted"], self.user_private_key).decode("utf-8")
-            self._decrypt_inbox_password(inbox_item, vault_password)
+            self._decrypt_inbox_password(inbox_item, self._get_inbox_key(inbox_item))
         
         return inbox_item
 
+    def list_inbox_items(self, deadline = None):
+        """List the inbox items shared with the user, without decrypting them."""
+        response = self.call("GET", "/api/v1/inbox-items", deadline = deadline)
+        return response.get("items", []) if isinstance(response, dict) else response
+
+    def get_inbox_items(self, inbox_item_ids: list[str], max_workers: int = 4, deadline = None):
+        """
+        Fetch inbox items through batch requests and decrypt them in parallel.
+
+        Inbox items that could not be fetched are left out, as in get_items.
+        """
+        if not inbox_item_ids:
+            return []
+
+        requests = [{"method": "GET", "relativeUrl": f"/api/v1/inbox-items/{id}"} for id in inbox_item_ids]
+        inbox_items = self.send_batch(requests, deadline)
+
+        if self.is_encrypt:
+            # The RSA decryption of the item keys dominates, it runs outside the GIL
+            def decrypt(inbox_item):
+                self._decrypt_inbox_password(inbox_item, self._get_inbox_key(inbox_item))
+
+            with ThreadPoolExecutor(max_workers = max_workers) as executor:
+                list(executor.map(decrypt, inbox_items))
+
+        return inbox_items
+
+    def iter_inbox(self, page_size: int = 25, max_workers: int = 4, deadline = None):
+        """
+        Yield all inbox items of the user, decrypted, `page_size` items at a time.
+
+        The next page is fetched while the current one is processed.
+        """
+        deadline = Deadline.coerce(deadline)
+        inbox_item_ids = [inbox_item["id"] for inbox_item in self.list_inbox_items(deadline)]
+
+        yield from self._iter_pages(
+            inbox_item_ids, lambda page: self.get_inbox_items(page, max_workers, deadline), page_size
+        )
+
+    def _get_inbox_key(self, inbox_item: dict):
+        """Decrypt the key of an inbox item."""
+        if not self.is_encrypt:
+            return ""
+
+        return rsa_decrypt(inbox_item["inbox"]["keyEncrypted"], self.get_private_key()).decode("utf-8")
+
     def _decrypt_inbox_password(self, password: dict, encrypted_key: str):
         if not encrypted_key:
             return password
 
         password["password"] = decrypt_item(password["passwordEncrypted"], encrypted_key)
 
-    def download_inbox_attachment(self, inbox: dict, download_path: str):
+    def download_inbox_attachment(self, inbox: dict, download_path: str, deadline = None):
 
         if "attachments" not in inbox or not inbox["attachments"]:
             return None
 
-        attachments_data = self.prepare_attachments_data(inbox["attachments"], inbox['id'])
+        attachments_data = self.prepare_attachments_data(inbox["attachments"], inbox['id'], deadline)
         if not attachments_data:
             return None
 
-        if self.is_encrypt:
-            encrypted_key = rsa_decrypt(inbox["inbox"]["keyEncrypted"], self.user_private_key).decode("utf-8")
-        else:
-            encrypted_key = ""
+        encrypted_key = self._get_inbox_key(inbox)
 
         for attachment_data in attachments_data:
-            decrypt_and_save_item_attachment(attachment_data, encrypted_key, download_path)
\ No newline at end of file
+            decrypt_and_save_item_attachment(attachment_data, encrypted_key, download_path)
+
+    def download_inbox_attachments(self, inbox_items: list[dict], download_path: str, max_workers: int = 8,
+                                   deadline = None) -> dict:
+        """
+        Download the attachments of many inbox items concurrently.
+
+        Attachments are saved to `download_path/<inbox item ID>/`. Returns the errors of
+        failed downloads, keyed by inbox item ID.
+        """
+        deadline = Deadline.coerce(deadline)
+        inbox_items = [inbox_item for inbox_item in inbox_items if inbox_item.get("attachments")]
+
+        def get_key(inbox_item):
+            try:
+                return self._get_inbox_key(inbox_item), None
+            except Exception as e:
+                return None, e
+
+        def download(inbox_item, attachment, key):
+            attachment_data = self.get_item_attachment(inbox_item["id"], attachment["id"], deadline)
+            decrypt_and_save_item_attachment(attachment_data, key, os.path.join(download_path, inbox_item["id"]))
+
+        failed = {}
+        with ThreadPoolExecutor(max_workers = max_workers) as executor:
+            # Each inbox key is decrypted once and passed to the downloads of its attachments
+            futures = []
+            for inbox_item, (key, error) in zip(inbox_items, executor.map(get_key, inbox_items)):
+                if error is not None:
+                    failed[inbox_item["id"]] = error
+                    continue
+                futures.extend(
+                    (inbox_item["id"], executor.submit(download, inbox_item, attachment, key))
+                    for attachment in inbox_item["attachments"]
+                )
+            for inbox_item_id, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    failed.setdefault(inbox_item_id, e)
+
+        return failed
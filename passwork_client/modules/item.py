@@ -1,31 +1,121 @@
 import json
-from ..crypto import encrypt_aes
+import copy
+import uuid
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from ..crypto import encrypt_aes, decrypt_aes
 from ..utils import (
     encrypt_item_customs,
     validate_item_customs,
     format_item_attachments,
-    decrypt_item, get_encryption_key,
+    decrypt_item,
     decrypt_item_attachments, decrypt_item_customs,
     decrypt_and_save_item_attachment
 )
+from ..deadline import Deadline
+from ..exceptions import PassworkError
+from ..search_index import SearchIndex
+from .batch import BATCH_SIZE
 
 class Item:
-    def create_item(self, item_data: dict) -> str:
-        vault = self.get_vault(item_data["vaultId"])
-        vault_password = self.get_vault_password(vault)
+    def create_item(self, item_data: dict, idempotency_key: str = None) -> str:
+        vault_password = self.get_vault_key(item_data["vaultId"])
+        plain_data = self._get_plain_fields(item_data) if self.search_index is not None else None
 
-        self.encrypt_item(item_data, vault_password)
-        self.encrypt_item_customs(item_data, vault_password)
-        self.encrypt_item_attachments(item_data, vault_password)
-        item_data.setdefault("name", "")
+        self._encrypt_new_item(item_data, vault_password)
+
+        # Lets a server that supports it recognize a retried create
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+        response = self.call("POST", "/api/v1/items", item_data, headers)
 
-        response = self.call("POST", "/api/v1/items", item_data)
+        self._invalidate_cached_searches()
+        if self.search_index is not None:
+            self.search_index.add({"name": "", **plain_data, "id": response["id"]})
 
         return response["id"]
 
-    def update_item(self, item_id: str, item_data: dict):
-        vault = self.get_vault(item_data["vaultId"])
-        vault_password = self.get_vault_password(vault)
+    def create_items(self, items, chunk_size: int = 25, max_workers: int = 4, deadline = None):
+        """
+        Create many items, e.g. for an import from another password manager.
+
+        Items are read from the iterable in chunks of `chunk_size`, encrypted in parallel
+        with vault keys from the key ring (each vault key is decrypted once) and created
+        through batch requests of up to BATCH_SIZE items. Yields one result per item, in
+        input order: {"index": ..., "id": ..., "error": None}, or with "id" None and the
+        exception in "error" if the item could not be encrypted or created.
+        """
+        deadline = Deadline.coerce(deadline)
+        items = iter(items)
+        index = 0
+
+        with ThreadPoolExecutor(max_workers = max_workers) as executor:
+            while chunk := list(itertools.islice(items, chunk_size)):
+                # Warm the key ring first, so that encryption threads do not fetch the same vault
+                vault_errors = {}
+                for vault_id in {item_data.get("vaultId") for item_data in chunk}:
+                    try:
+                        self.get_vault_key(vault_id)
+                    except Exception as e:
+                        vault_errors[vault_id] = e
+
+                def prepare(item_data):
+                    if item_data.get("vaultId") in vault_errors:
+                        return None, vault_errors[item_data.get("vaultId")]
+                    try:
+                        plain_data = self._get_plain_fields(item_data) if self.search_index is not None else None
+                        self._encrypt_new_item(item_data, self.get_vault_key(item_data["vaultId"]))
+                        return plain_data, None
+                    except Exception as e:
+                        return None, e
+
+                prepared = list(executor.map(prepare, chunk))
+                results = [{"index": index + i, "id": None, "error": error} for i, (_, error) in enumerate(prepared)]
+
+                pending = [i for i, (_, error) in enumerate(prepared) if error is None]
+                for group in [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]:
+                    requests = [{"method": "POST", "relativeUrl": "/api/v1/items", "body": chunk[i]} for i in group]
+                    try:
+                        responses = self.batch_request_responses(requests, deadline)
+                    except PassworkError as e:
+                        responses = [None] * len(group)
+                        for i in group:
+                            results[i]["error"] = e
+
+                    # Items without a sub-response may or may not have been created
+                    for i in group[len(responses):]:
+                        results[i]["error"] = PassworkError("No response to the batch sub-request", "missing_batch_response")
+
+                    for i, response in zip(group, responses):
+                        if response is None:
+                            continue
+                        if response["statusCode"] != 200:
+                            results[i]["error"] = self.batch_response_error(response)
+                            continue
+                        results[i]["id"] = response["body"]["id"]
+                        if self.search_index is not None:
+                            self.search_index.add({"name": "", **prepared[i][0], "id": results[i]["id"]})
+
+                if pending:
+                    self._invalidate_cached_searches()
+
+                yield from results
+                index += len(chunk)
+
+    def update_item(self, item_id: str, item_data: dict, partial: bool = False):
+        """
+        Update an item.
+
+        By default every given field is encrypted and sent. With `partial`, the given
+        fields are compared with the current item and only changed ones are encrypted
+        (with the existing item key) and sent; nothing is sent if nothing changed.
+        In this mode "attachments" lists the attachments to keep, as dicts with their
+        "id", plus new ones with a "path"; kept attachments are sent by reference only.
+        """
+        if partial:
+            return self._update_item_partial(item_id, item_data)
+
+        vault_password = self.get_vault_key(item_data["vaultId"])
+        plain_data = self._get_plain_fields(item_data) if self.search_index is not None else None
 
         self.encrypt_item(item_data, vault_password)
         self.encrypt_item_customs(item_data, vault_password)
@@ -33,33 +123,222 @@ class Item:
 
         response = self.call("PATCH", f"/api/v1/items/{item_id}", item_data)
 
+        self._invalidate_cached_item(item_id)
+        if self.search_index is not None:
+            self.search_index.update(item_id, plain_data)
+
+    def _update_item_partial(self, item_id: str, item_data: dict):
+        # Changes are computed against the server's copy, a stale cached one could hide them
+        self._invalidate_cached_item(item_id)
+        current = self._get_item(item_id)
+        changes, plain_data = self._get_item_changes(current, item_data)
+        if not changes:
+            return
+
+        self.call("PATCH", f"/api/v1/items/{item_id}", changes)
+
+        self._invalidate_cached_item(item_id)
+        if self.search_index is not None:
+            self.search_index.update(item_id, plain_data)
+
+    def _get_item_changes(self, current: dict, item_data: dict):
+        """
+        Compare item data with the current decrypted item.
+
+        Returns a tuple (changes, plain_data): the changed fields encrypted with the
+        existing item key, ready to be sent as a PATCH, and the same fields unencrypted.
+        Both are empty if nothing changed.
+        """
+        if item_data.get("vaultId", current.get("vaultId")) != current.get("vaultId"):
+            raise PassworkError("Items are moved between vaults with move_items", "vault_change_not_supported")
+
+        changes = {}
+        for field, value in item_data.items():
+            if field not in ("vaultId", "attachments", "customs") and value != current.get(field):
+                changes[field] = value
+
+        if "customs" in item_data:
+            custom_values = lambda customs: [(c.get("name"), c.get("type"), c.get("value")) for c in customs or []]
+            if custom_values(item_data["customs"]) != custom_values(current.get("customs")):
+                changes["customs"] = item_data["customs"]
+
+        # Kept attachments are referenced by ID, only new files are read and encrypted
+        if "attachments" in item_data:
+            kept = [attachment for attachment in item_data["attachments"] if attachment.get("id")]
+            added = [attachment for attachment in item_data["attachments"] if not attachment.get("id")]
+            current_ids = {attachment["id"] for attachment in current.get("attachments") or []}
+            if added or {attachment["id"] for attachment in kept} != current_ids:
+                changes["attachments"] = [{"id": attachment["id"]} for attachment in kept] + added
+
+        if not changes:
+            return {}, {}
+
+        plain_data = self._get_plain_fields(changes)
+
+        # Changed fields are encrypted with the existing item key, so unchanged ones stay readable
+        item_key = self.get_item_key(current)
+        if "password" in changes:
+            changes["passwordEncrypted"] = encrypt_aes(changes.pop("password"), item_key)
+        self.encrypt_item_customs(changes, item_key)
+        if changes.get("attachments"):
+            new_attachments = format_item_attachments([a for a in changes["attachments"] if "path" in a], item_key)
+            changes["attachments"] = [a for a in changes["attachments"] if "id" in a] + new_attachments
+
+        return changes, plain_data
+
     def delete_item(self, item_id: str):
         response = self.call('DELETE', f"/api/v1/items/{item_id}")
 
+        self._invalidate_cached_item(item_id)
+        if self.search_index is not None:
+            self.search_index.remove(item_id)
+
         return response["binItemId"]
 
-    def get_item(self, item_id: str):
-        item_data = self.call("GET", f"/api/v1/items/{item_id}")
+    def get_item(self, item_id: str, deadline = None):
+        item_data = self._get_cached_item(item_id)
+        if item_data is not None:
+            return item_data
 
-        if self.is_encrypt:
-            encrypted_key = get_encryption_key(
-                item_data["vaultMasterKeyEncrypted"],
-                item_data["keyEncrypted"],
-                self.user_private_key
-            )
-        else:
-            encrypted_key = ''
+        # Concurrent requests for the same item share one fetch and decryption
+        if self.single_flight:
+            return self.single_flight.do(("get_item", item_id), lambda: self._get_item(item_id, deadline))
+        return self._get_item(item_id, deadline)
+
+    def _get_item(self, item_id: str, deadline = None):
+        # Revalidate an expired cache entry instead of downloading and decrypting it again
+        cached_item, validators = self.item_cache.peek(item_id) if self.item_cache else (None, None)
+        item_data = self.call("GET", f"/api/v1/items/{item_id}", deadline = deadline, validators = validators)
+
+        if cached_item is not None and self._is_item_unchanged(item_data, cached_item):
+            self.item_cache.touch(item_id, validators)
+            return cached_item
+
+        encrypted_key = self.get_item_key(item_data)
 
         self.decrypt_item(item_data, encrypted_key)
 
         self.decrypt_item_customs(item_data, encrypted_key)
 
+        self._cache_item(item_id, item_data, validators)
+
         return item_data
 
-    def get_items(self, item_ids: list[str]):
+    @staticmethod
+    def _is_item_unchanged(item_data: dict, cached_item: dict) -> bool:
+        """
+        Check a response against a cached item: either the server answered 304, or,
+        where it sends no validators, the item's updatedAt did not change.
+        """
+        if item_data.get("_not_modified"):
+            return True
+        updated_at = item_data.get("updatedAt")
+        return updated_at is not None and updated_at == cached_item.get("updatedAt")
+
+    def _get_cached_item(self, item_id: str, stale_ids: list | None = None):
+        """Look up a decrypted item in the memory cache, then in the persistent cache."""
+        if self.item_cache:
+            item_data, is_stale = self.item_cache.get(item_id)
+            if item_data is not None:
+                if is_stale and stale_ids is not None:
+                    # The caller refreshes all stale entries at once
+                    stale_ids.append(item_id)
+                elif is_stale:
+                    self._revalidate_cached_items([item_id])
+                return item_data
+
+        if self.response_cache:
+            item_data = self.response_cache.get(f"item:{item_id}")
+            if item_data is not None:
+                if self.item_cache:
+                    self.item_cache.set(item_id, item_data)
+                return item_data
+
+        return None
+
+    def _cache_item(self, item_id: str, item_data: dict, validators: dict | None = None):
+        if self.item_cache:
+            self.item_cache.set(item_id, item_data, validators)
+        if self.response_cache:
+            self.response_cache.set(f"item:{item_id}", item_data)
+
+    def _invalidate_cached_item(self, item_id: str):
+        if self.item_cache:
+            self.item_cache.invalidate(item_id)
+        if self.response_cache:
+            self.response_cache.invalidate(f"item:{item_id}")
+        self._invalidate_cached_searches()
+
+    def _search_cache_key(self, kind: str, payload: dict) -> str:
+        """Key of cached search results, which includes the current search generation."""
+        generation = self.response_cache.get("search:generation") or 0
+        return f"search:{generation}:{kind}:{json.dumps(payload, sort_keys = True)}"
+
+    def _invalidate_cached_searches(self):
+        """
+        Drop all cached search results after a write, in this and other processes.
+
+        Cache keys are hashed, so entries cannot be found by prefix; instead a new search
+        generation makes every cached result unreachable until it expires.
+        """
+        if self.response_cache:
+            self.response_cache.set("search:generation", uuid.uuid4().hex)
+
+    def _revalidate_cached_items(self, item_ids: list[str]):
+        """
+        Refresh stale cache entries in the background while the stale copies are served.
+
+        All entries that are not already being refreshed are fetched with one batch request
+        on the cache's refresh pool.
+        """
+        item_ids = [id for id in item_ids if self.item_cache.start_refresh(id)]
+        if not item_ids:
+            return
+
+        def refresh():
+            try:
+                fetched_ids = {item_data["id"] for item_data in self._fetch_items(item_ids)}
+                for id in item_ids:
+                    if id not in fetched_ids:
+                        # The server rejected the item (e.g. it was deleted), stop serving it
+                        self._invalidate_cached_item(id)
+            except Exception:
+                # Transient failure, the stale entries expire on their own
+                pass
+            finally:
+                for id in item_ids:
+                    self.item_cache.finish_refresh(id)
+
+        self.item_cache.submit_refresh(refresh)
+
+    def get_items(self, item_ids: list[str], deadline = None):
         if not item_ids:
             return []
 
+        if not (self.item_cache or self.response_cache):
+            return self._fetch_items(item_ids, deadline)
+
+        items = {}
+        missing_ids = []
+        stale_ids = []
+        for id in item_ids:
+            item_data = self._get_cached_item(id, stale_ids)
+            if item_data is None:
+                missing_ids.append(id)
+            else:
+                items[id] = item_data
+
+        if stale_ids:
+            self._revalidate_cached_items(stale_ids)
+
+        if missing_ids:
+            items.update({item_data["id"]: item_data for item_data in self._fetch_items(missing_ids, deadline)})
+
+        # Items come back in the order of item_ids; items that failed to load are left out
+        return [items[id] for id in item_ids if id in items]
+
+    def _fetch_items(self, item_ids: list[str], deadline = None):
+        """Batch-fetch and decrypt items, bypassing cache lookups."""
         requests = []
         for id in item_ids:
             requests.append({
@@ -67,30 +346,30 @@ class Item:
                 "relativeUrl": f"/api/v1/items/{id}",
             })
 
-        items = self.send_batch(requests)
-
-        # Process each item in the response
-        decrypted_items = []
-        for item_data in items:
-            if self.is_encrypt:
-                encrypted_key = get_encryption_key(
-                    item_data["vaultMasterKeyEncrypted"],
-                    item_data["keyEncrypted"],
-                    self.user_private_key
-                )
-            else:
-                encrypted_key = ''
-                
-            # Decrypt the item using the same methods as get_item
-            self.decrypt_item(item_data, encrypted_key)
-            self.decrypt_item_customs(item_data, encrypted_key)
+        items = self.send_batch(requests, deadline)
 
-            decrypted_items.append(item_data)
+        return [self._decrypt_fetched_item(item_data) for item_data in items]
 
-        return decrypted_items
+    def _decrypt_fetched_item(self, item_data: dict):
+        """Decrypt an item of a batch response and cache it."""
+        # Batch responses carry no validators, reuse cached items whose updatedAt did not change
+        cached_item = self.item_cache.peek(item_data["id"])[0] if self.item_cache else None
+        if cached_item is not None and self._is_item_unchanged(item_data, cached_item):
+            self.item_cache.touch(item_data["id"])
+            return cached_item
+
+        encrypted_key = self.get_item_key(item_data)
+
+        # Decrypt the item using the same methods as get_item
+        self.decrypt_item(item_data, encrypted_key)
+        self.decrypt_item_customs(item_data, encrypted_key)
+
+        self._cache_item(item_data["id"], item_data)
+
+        return item_data
 
     def search_items(self, query: str = None, tags: list[str] = None, color_codes: list[int] = None, url: str = None,
-               vault_ids: list[str] = None, folder_ids: list[str] = None):
+               vault_ids: list[str] = None, folder_ids: list[str] = None, deadline = None):
         # Build payload with only non-None parameters
         payload = {}
         if query is not None:
@@ -106,55 +385,180 @@ class Item:
         if folder_ids is not None:
             payload["folderIds"] = folder_ids
             
+        if self.response_cache:
+            cache_key = self._search_cache_key("items", payload)
+            cached_results = self.response_cache.get(cache_key)
+            if cached_results is not None:
+                return cached_results
+
         # Make the request using the call method which will handle array formatting
-        search_results = self.call("GET", "/api/v1/items/search", payload)
+        search_results = self.call("GET", "/api/v1/items/search", payload, deadline = deadline)
+
+        if self.response_cache:
+            self.response_cache.set(cache_key, search_results.get("items", []))
 
         return search_results.get("items", [])
         
+    def build_search_index(self, query: str = None, tags: list[str] = None, color_codes: list[int] = None, url: str = None,
+                           vault_ids: list[str] = None, folder_ids: list[str] = None, items: list[dict] = None):
+        """
+        Build a local search index and attach it to the client.
+
+        The index is built from `items` if given (e.g. a search_and_decrypt result or a
+        vault sync), otherwise from a search_and_decrypt with the given filters. Once
+        attached, create_item, update_item and delete_item keep it up to date, and
+        search_index.search(...) answers queries without requests to the server.
+        """
+        if items is None:
+            items = self.search_and_decrypt(query, tags, color_codes, url, vault_ids, folder_ids)
+
+        self.search_index = SearchIndex(items)
+        return self.search_index
+
+    def search_items_sharded(self, query: str = None, tags: list[str] = None, color_codes: list[int] = None, url: str = None,
+                             vault_ids: list[str] = None, folder_ids: list[str] = None, shard_size: int = 50,
+                             max_workers: int = 8, deadline = None):
+        """
+        Search items with large vault or folder filters.
+
+        The filters are split into shards of at most `shard_size` IDs, which are searched
+        concurrently; the results are merged and de-duplicated by item ID. This keeps
+        query strings short when searching hundreds of vaults or folders.
+        """
+        return self._fan_out_search(self.search_items, lambda item: item["id"], query, tags, color_codes, url,
+                                    vault_ids, folder_ids, shard_size, max_workers, deadline)
+
+    def _fan_out_search(self, search, get_id, query, tags, color_codes, url, vault_ids, folder_ids,
+                        shard_size, max_workers, deadline):
+        deadline = Deadline.coerce(deadline)
+
+        def split(ids):
+            if ids is None:
+                return [None]
+            return [ids[i:i + shard_size] for i in range(0, len(ids), shard_size)] or [ids]
+
+        # Results must match a vault and a folder, so every pair of shards is one query
+        shards = [(vault_shard, folder_shard) for vault_shard in split(vault_ids) for folder_shard in split(folder_ids)]
+        if len(shards) == 1:
+            return search(query, tags, color_codes, url, vault_ids, folder_ids, deadline)
+
+        with ThreadPoolExecutor(max_workers = min(max_workers, len(shards))) as executor:
+            futures = [
+                executor.submit(search, query, tags, color_codes, url, vault_shard, folder_shard, deadline)
+                for vault_shard, folder_shard in shards
+            ]
+            shard_results = [future.result() for future in futures]
+
+        merged = {}
+        for results in shard_results:
+            for result in results:
+                merged.setdefault(get_id(result), result)
+        return list(merged.values())
+
     def search_and_decrypt(self, query: str = None, tags: list[str] = None, color_codes: list[int] = None, url: str = None,
-                          vault_ids: list[str] = None, folder_ids: list[str] = None):
-        # Get search results
-        search_results = self.search_items(query, tags, color_codes, url, vault_ids, folder_ids)
+                          vault_ids: list[str] = None, folder_ids: list[str] = None, deadline = None, shard_size: int = None):
+        # One deadline is shared by the search and the batch fetch
+        deadline = Deadline.coerce(deadline)
+
+        # Get search results, sharding large vault and folder filters if requested
+        if shard_size:
+            search_results = self.search_items_sharded(query, tags, color_codes, url, vault_ids, folder_ids,
+                                                       shard_size, deadline = deadline)
+        else:
+            search_results = self.search_items(query, tags, color_codes, url, vault_ids, folder_ids, deadline)
         
         # Extract item IDs from search results
         item_ids = [item["id"] for item in search_results]
 
         # Get and decrypt detailed information for all items
         if item_ids:
-            return self.get_items(item_ids)
+            return self.get_items(item_ids, deadline)
         else:
             return []
 
-    def download_item_attachment(self, item: dict, download_path: str):
+    def iter_search(self, query: str = None, tags: list[str] = None, color_codes: list[int] = None, url: str = None,
+                    vault_ids: list[str] = None, folder_ids: list[str] = None, page_size: int = 100, deadline = None):
+        """
+        Search items and yield them decrypted, `page_size` items at a time.
+
+        Unlike search_and_decrypt, items are fetched and decrypted page by page, and the
+        next page is fetched while the current one is consumed, so large vaults need
+        neither one huge batch nor all decrypted items in memory at once.
+        """
+        deadline = Deadline.coerce(deadline)
+        search_results = self.search_items(query, tags, color_codes, url, vault_ids, folder_ids, deadline)
+        item_ids = [item["id"] for item in search_results]
+
+        yield from self._iter_pages(item_ids, lambda page: self.get_items(page, deadline), page_size)
+
+    def download_item_attachment(self, item: dict, download_path: str, deadline = None):
         attachments = item.get("attachments")
 
-        attachments_data = self.prepare_attachments_data(attachments, item.get("id"))
+        attachments_data = self.prepare_attachments_data(attachments, item.get("id"), deadline)
         if not attachments_data:
             return None
 
-        encrypted_key = ''
+        encrypted_key = self.get_item_key(item)
 
-        if self.is_encrypt:
-            encrypted_key = get_encryption_key(
-                item["vaultMasterKeyEncrypted"],
-                item["keyEncrypted"],
-                self.user_private_key
-            )
         for attachment_data in attachments_data:
             decrypt_and_save_item_attachment(attachment_data, encrypted_key, download_path)
 
-    def prepare_attachments_data(self, attachments: dict, item_id: str):
+    def prepare_attachments_data(self, attachments: dict, item_id: str, deadline = None):
+        # One deadline is shared by all attachment downloads
+        deadline = Deadline.coerce(deadline)
+
         attachments_data = []
         for attachment in attachments:
-            attachments_data.append(self.get_item_attachment(item_id, attachment["id"]))
+            attachments_data.append(self.get_item_attachment(item_id, attachment["id"], deadline))
 
         if not attachments_data:
             return None
 
         return attachments_data
 
-    def get_item_attachment(self, item_id: str, attachment_id: str):
-        return self.call("GET", f"/api/v1/items/{item_id}/attachment/{attachment_id}")
+    def get_item_attachment(self, item_id: str, attachment_id: str, deadline = None):
+        endpoint = f"/api/v1/items/{item_id}/attachment/{attachment_id}"
+        if not self.item_cache:
+            return self.call("GET", endpoint, deadline = deadline)
+
+        cache_key = f"attachment:{item_id}:{attachment_id}"
+        attachment, is_stale = self.item_cache.get(cache_key)
+        if attachment is not None and not is_stale:
+            return attachment
+
+        # Revalidate the cached attachment instead of downloading it again
+        cached_attachment, validators = self.item_cache.peek(cache_key)
+        attachment = self.call("GET", endpoint, deadline = deadline, validators = validators)
+        if attachment.get("_not_modified") and cached_attachment is not None:
+            self.item_cache.touch(cache_key, validators)
+            return cached_attachment
+
+        self.item_cache.set(cache_key, attachment, validators)
+        return attachment
+
+    @staticmethod
+    def _get_plain_fields(item_data: dict) -> dict:
+        """Copy the fields of an item before they are encrypted in place, for the search index."""
+        return {
+            field: copy.deepcopy(value) for field, value in item_data.items()
+            if field not in ("attachments", "passwordEncrypted", "keyEncrypted")
+        }
+
+    def get_item_key(self, item_data: dict) -> str:
+        """
+        Decrypt the key of an item.
+
+        The vault master key is taken from the key ring, so the RSA decryption runs only
+        once per vault instead of once per item.
+        """
+        if not self.is_encrypt:
+            return ''
+
+        vault_password = self.get_vault_password({
+            "id": item_data.get("vaultId"),
+            "masterKeyEncrypted": item_data["vaultMasterKeyEncrypted"],
+        })
+        return decrypt_aes(item_data["keyEncrypted"], vault_password)
 
     def decrypt_item(self, item_data: dict, encrypted_key: str):
         if "passwordEncrypted" in item_data and item_data["passwordEncrypted"]:
@@ -168,6 +572,12 @@ class Item:
             for custom in item_data["customs"]:
                 decrypt_item_customs(custom, encrypted_key)
 
+    def _encrypt_new_item(self, item_data: dict, vault_password: str):
+        self.encrypt_item(item_data, vault_password)
+        self.encrypt_item_customs(item_data, vault_password)
+        self.encrypt_item_attachments(item_data, vault_password)
+        item_data.setdefault("name", "")
+
     def encrypt_item(self, item_data: dict, vault_password: str):
         if "password" in item_data:
             item_data["passwordEncrypted"] = encrypt_aes(item_data["password"], vault_password)
@@ -1,7 +1,11 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
 from ..crypto import (generate_key, get_hash, encrypt_aes, decrypt_aes)
-from ..utils import get_encryption_key
 from ..enums.link_type_enum import LinkType
 from ..enums.link_expiration_time_enum import LinkExpirationTime
+from ..deadline import Deadline
+from ..exceptions import PassworkError
+from .batch import BATCH_SIZE
 
 class Link:
 
@@ -13,6 +17,83 @@ class Link:
         else:
             item = self.get_item(item_id)
 
+        payload, code = self._prepare_link(item, type, expiration_time, shortcut_id)
+
+        response = self.call("POST", "/api/v1/links", payload)
+
+        url = response["url"]
+        if code:
+            url = url + f"#code={code}"
+        return url
+
+    def create_links(self, type: LinkType, expiration_time: LinkExpirationTime, item_ids: list[str] = None,
+                     shortcut_ids: list[str] = None, max_workers: int = 4, deadline = None) -> list[dict]:
+        """
+        Create share links for many items and shortcuts at once.
+
+        Items and shortcuts are fetched in batches, using vault keys from the key ring,
+        the per-link encryption runs in a thread pool and the links are created through
+        batch requests. Returns one result per item and then per shortcut, in input order:
+        {"itemId", "shortcutId", "url", "error"}.
+        """
+        deadline = Deadline.coerce(deadline)
+        item_ids = list(item_ids or [])
+        shortcut_ids = list(shortcut_ids or [])
+
+        sources = [{"itemId": id, "shortcutId": None} for id in item_ids]
+        sources += [{"itemId": None, "shortcutId": id} for id in shortcut_ids]
+        results = [{**source, "url": None, "error": None} for source in sources]
+
+        shortcuts, errors = {}, {}
+        for i in range(0, len(shortcut_ids), BATCH_SIZE):
+            batch_shortcuts, batch_errors = self.send_batch_by_key(
+                {id: {"method": "GET", "relativeUrl": f"/api/v1/shortcuts/{id}"} for id in shortcut_ids[i:i + BATCH_SIZE]}, deadline
+            )
+            shortcuts.update(batch_shortcuts)
+            errors.update(batch_errors)
+        for source, result in zip(sources, results):
+            if source["shortcutId"] in shortcuts:
+                source["itemId"] = result["itemId"] = shortcuts[source["shortcutId"]]["id"]
+
+        wanted_ids = list(dict.fromkeys(source["itemId"] for source in sources if source["itemId"]))
+        items = {item["id"]: item for item in self.get_items(wanted_ids, deadline)}
+
+        def prepare(source):
+            if source["itemId"] not in items:
+                return None, None, errors.get(source["shortcutId"]) or PassworkError(
+                    f"Item {source['itemId'] or source['shortcutId']} not found", "item_not_found"
+                )
+            try:
+                # Items are encrypted in place, links to the same item need their own copy
+                payload, code = self._prepare_link(copy.deepcopy(items[source["itemId"]]), type, expiration_time, source["shortcutId"])
+                return payload, code, None
+            except Exception as e:
+                return None, None, e
+
+        requests, codes = {}, {}
+        with ThreadPoolExecutor(max_workers = max_workers) as executor:
+            for index, (payload, code, error) in enumerate(executor.map(prepare, sources)):
+                if error is not None:
+                    results[index]["error"] = error
+                    continue
+                requests[index] = {"method": "POST", "relativeUrl": "/api/v1/links", "body": payload}
+                codes[index] = code
+
+        indexes = list(requests)
+        for i in range(0, len(indexes), BATCH_SIZE):
+            responses, batch_errors = self.send_batch_by_key({index: requests[index] for index in indexes[i:i + BATCH_SIZE]}, deadline)
+            for index, response in responses.items():
+                url = response["url"]
+                if codes[index]:
+                    url = url + f"#code={codes[index]}"
+                results[index]["url"] = url
+            for index, error in batch_errors.items():
+                results[index]["error"] = error
+
+        return results
+
+    def _prepare_link(self, item: dict, type: LinkType, expiration_time: LinkExpirationTime, shortcut_id: str = None):
+        """Encrypt an item with a new link key; returns the link payload and the key to append to the URL."""
         item_data = {
             "name": item["name"],
             "login": item["login"],
@@ -25,11 +106,7 @@ class Link:
         link_key_encrypted = None
         if self.is_encrypt:
             code = generate_key()
-            encrypted_key = get_encryption_key(
-                item["vaultMasterKeyEncrypted"],
-                item["keyEncrypted"],
-                self.user_private_key
-            )
+            encrypted_key = self.get_item_key(item)
 
             link_key_hash = get_hash(code)
             link_key_encrypted = encrypt_aes(code, encrypted_key)
@@ -65,9 +142,4 @@ class Link:
         if shortcut_id:
             payload["shortcutId"] = shortcut_id
 
-        response = self.call("POST", "/api/v1/links", payload)
-
-        url = response["url"]
-        if code:
-            url = url + f"#code={code}"
-        return url
+        return payload, code
@@ -1,7 +1,7 @@
 import hashlib
 import base64
 from pbkdf2 import PBKDF2
-from ..crypto import decrypt_aes
+from ..crypto import decrypt_aes, load_private_key
 from ..exceptions import PassworkError
 
 class MasterKeyManager:
@@ -39,6 +39,12 @@ class MasterKeyManager:
         """
         Set the master key directly, update encryption status, and fetch/decrypt user keys.
         """
+        # Keys and items decrypted with the previous key material must not be served anymore
+        self.vault_keys = {}
+        self.parsed_private_key = None
+        if getattr(self, "item_cache", None):
+            self.item_cache.clear()
+
         if not master_key:
             # Disable encryption and clear related attributes
             self.is_encrypt = False
@@ -69,4 +75,15 @@ class MasterKeyManager:
             self.user_public_key = None
             self.is_encrypt = False
             # Simply propagate the exception
-            raise 
\ No newline at end of file
+            raise 
+
+    def get_private_key(self):
+        """
+        Get the user private key parsed for RSA decryption.
+
+        The parsed key is kept on the client and dropped by set_master_key together with
+        the key ring.
+        """
+        if self.parsed_private_key is None or self.parsed_private_key[0] != self.user_private_key:
+            self.parsed_private_key = (self.user_private_key, load_private_key(self.user_private_key))
+        return self.parsed_private_key[1]
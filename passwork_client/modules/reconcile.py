@@ -0,0 +1,134 @@
+import copy
+from ..deadline import Deadline
+from ..exceptions import PassworkError
+from ..utils import item_fingerprint
+from .batch import BATCH_SIZE
+
+class Reconcile:
+    """
+    Declarative management of the items of a vault.
+
+    A desired state lists the items a vault should contain:
+
+        {"vaultId": "...", "prune": false, "items": [{"name": "...", "folderId": null, "password": "...", ...}]}
+
+    Items are identified by their folder and name. Only the fields given for an item are
+    managed; other fields (and attachments) are left as they are. With "prune", items of
+    the vault that are not listed are deleted.
+    """
+    def plan(self, desired_state: dict, deadline = None) -> dict:
+        """
+        Compare a desired state with the vault.
+
+        The current items are fetched in batches and compared with the desired ones by a
+        fingerprint of their managed fields. Returns a plan for apply:
+        {"vaultId", "create": [items], "update": [{"id", "item", "current"}], "delete": [{"id", "name"}],
+        "unchanged": count}. The plan holds decrypted secrets.
+
+        Raises a PassworkError if any item of the vault cannot be fetched, or if the vault
+        holds several items with the same folder and name, since either would make the plan
+        create duplicates or miss items.
+        """
+        deadline = Deadline.coerce(deadline)
+        vault_id = desired_state["vaultId"]
+
+        # The current state is not served from the response cache
+        summaries = self.call("GET", "/api/v1/items/search", {"vaultIds": [vault_id]}, deadline = deadline)
+        current_items = {}
+        for item in self._fetch_current_items([item["id"] for item in summaries.get("items", [])], deadline):
+            key = (item.get("folderId"), item.get("name"))
+            if key in current_items:
+                raise PassworkError(
+                    f"Items {current_items[key]['id']} and {item['id']} are both named {item.get('name')}",
+                    "duplicate_current_item"
+                )
+            current_items[key] = item
+
+        plan = {"vaultId": vault_id, "create": [], "update": [], "delete": [], "unchanged": 0}
+        desired_keys = set()
+        for desired in desired_state.get("items", []):
+            desired = {field: value for field, value in desired.items() if field != "attachments"}
+            key = (desired.get("folderId"), desired["name"])
+            if key in desired_keys:
+                raise PassworkError(f"Item {desired['name']} is listed twice", "duplicate_desired_item")
+            desired_keys.add(key)
+
+            current = current_items.get(key)
+            if current is None:
+                plan["create"].append({**desired, "vaultId": vault_id})
+            elif item_fingerprint(desired, desired) != item_fingerprint(current, desired):
+                plan["update"].append({"id": current["id"], "item": {**desired, "vaultId": vault_id}, "current": current})
+            else:
+                plan["unchanged"] += 1
+
+        if desired_state.get("prune"):
+            for key, current in current_items.items():
+                if key not in desired_keys:
+                    plan["delete"].append({"id": current["id"], "name": current.get("name")})
+
+        return plan
+
+    def _fetch_current_items(self, item_ids: list[str], deadline) -> list[dict]:
+        """Batch-fetch and decrypt items, failing if any of them cannot be fetched."""
+        items = []
+        for i in range(0, len(item_ids), BATCH_SIZE):
+            chunk = item_ids[i:i + BATCH_SIZE]
+            bodies, errors = self.send_batch_by_key(
+                {id: {"method": "GET", "relativeUrl": f"/api/v1/items/{id}"} for id in chunk}, deadline
+            )
+            missing = [id for id in chunk if id not in bodies]
+            if missing:
+                raise PassworkError(
+                    f"Can't fetch {len(missing)} items of the vault, e.g. {missing[0]}: {errors.get(missing[0])}",
+                    "plan_fetch_failed"
+                )
+            items.extend(self._decrypt_fetched_item(bodies[id]) for id in chunk)
+        return items
+
+    def apply(self, plan: dict, deadline = None) -> dict:
+        """
+        Apply a plan with batched creates, updates and deletes.
+
+        Returns:
+            dict: {"created": [item IDs], "updated": [item IDs], "deleted": [item IDs],
+            "failed": {item ID, or index in plan["create"] for creates: error}}
+        """
+        deadline = Deadline.coerce(deadline)
+        result = {"created": [], "updated": [], "deleted": [], "failed": {}}
+
+        # create_items encrypts the items in place, the plan stays readable
+        for create_result in self.create_items(copy.deepcopy(plan["create"]), deadline = deadline):
+            if create_result["error"] is not None:
+                result["failed"][create_result["index"]] = create_result["error"]
+            else:
+                result["created"].append(create_result["id"])
+
+        requests, plain_changes = {}, {}
+        for update in plan["update"]:
+            try:
+                changes, plain_changes[update["id"]] = self._get_item_changes(update["current"], update["item"])
+            except Exception as e:
+                result["failed"][update["id"]] = e
+                continue
+            if changes:
+                requests[update["id"]] = {"method": "PATCH", "relativeUrl": f"/api/v1/items/{update['id']}", "body": changes}
+        for delete in plan["delete"]:
+            requests[delete["id"]] = {"method": "DELETE", "relativeUrl": f"/api/v1/items/{delete['id']}"}
+
+        request_ids = list(requests)
+        for i in range(0, len(request_ids), BATCH_SIZE):
+            chunk = {id: requests[id] for id in request_ids[i:i + BATCH_SIZE]}
+            responses, errors = self.send_batch_by_key(chunk, deadline)
+            for item_id in responses:
+                self._invalidate_cached_item(item_id)
+                if chunk[item_id]["method"] == "DELETE":
+                    result["deleted"].append(item_id)
+                    if self.search_index is not None:
+                        self.search_index.remove(item_id)
+                else:
+                    result["updated"].append(item_id)
+                    if self.search_index is not None:
+                        self.search_index.update(item_id, plain_changes[item_id])
+            result["failed"].update(errors)
+
+        return result
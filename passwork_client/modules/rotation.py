@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+from ..crypto import encrypt_aes, generate_user_password
+from ..deadline import Deadline
+from ..utils import parse_timestamp
+
+class Rotation:
+    def rotate_passwords(self, query: str = None, tags: list[str] = None, color_codes: list[int] = None, url: str = None,
+                         vault_ids: list[str] = None, folder_ids: list[str] = None, length: int = 32,
+                         complexity: dict = None, updated_before: str = None, chunk_size: int = 25,
+                         max_workers: int = 4, deadline = None) -> dict:
+        """
+        Replace the passwords of all items matching a search with generated ones.
+
+        New passwords follow the `complexity` policy of generate_user_password (minLength,
+        isDigitsRequired, isUppercaseRequired, isSpecialCharactersRequired). They are
+        encrypted with the existing item keys, whose vault keys come from the key ring, and
+        sent as PATCH requests in concurrent batches of `chunk_size`. Items updated at or
+        after `updated_before` (an ISO timestamp or a Unix time, like updatedAt) are skipped.
+
+        Returns:
+            dict: {"rotated": [item IDs], "failed": {item ID: error}, "skipped": [item IDs]}
+        """
+        deadline = Deadline.coerce(deadline)
+        report = {"rotated": [], "failed": {}, "skipped": []}
+
+        search_results = self.search_items(query, tags, color_codes, url, vault_ids, folder_ids, deadline)
+        cutoff = parse_timestamp(updated_before)
+        item_ids = []
+        for item in search_results:
+            updated_at = parse_timestamp(item.get("updatedAt"))
+            if cutoff is not None and updated_at is not None and updated_at >= cutoff:
+                report["skipped"].append(item["id"])
+            else:
+                item_ids.append(item["id"])
+
+        chunks = [item_ids[i:i + chunk_size] for i in range(0, len(item_ids), chunk_size)]
+        with ThreadPoolExecutor(max_workers = max_workers) as executor:
+            for rotated, failed in executor.map(
+                lambda chunk: self._rotate_chunk(chunk, length, complexity or {}, deadline), chunks
+            ):
+                report["rotated"].extend(rotated)
+                report["failed"].update(failed)
+
+        return report
+
+    def _rotate_chunk(self, item_ids: list[str], length: int, complexity: dict, deadline):
+        # Only the item keys are needed, the current passwords are not decrypted
+        items, failed = self.send_batch_by_key(
+            {id: {"method": "GET", "relativeUrl": f"/api/v1/items/{id}"} for id in item_ids}, deadline
+        )
+
+        passwords, requests = {}, {}
+        for item_id, item_data in items.items():
+            try:
+                passwords[item_id] = generate_user_password(length, complexity)
+                password_encrypted = encrypt_aes(passwords[item_id], self.get_item_key(item_data))
+            except Exception as e:
+                failed[item_id] = e
+                continue
+            requests[item_id] = {
+                "method": "PATCH",
+                "relativeUrl": f"/api/v1/items/{item_id}",
+                "body": {"passwordEncrypted": password_encrypted},
+            }
+
+        if not requests:
+            return [], failed
+
+        updated, update_errors = self.send_batch_by_key(requests, deadline)
+        failed.update(update_errors)
+        for item_id in updated:
+            self._invalidate_cached_item(item_id)
+            if self.search_index is not None:
+                self.search_index.update(item_id, {"password": passwords[item_id]})
+
+        return list(updated), failed
@@ -34,6 +34,12 @@ class SessionManager:
 
         return encryption_key
 
+    def get_session_secret(self):
+        """Secret identifying the current session, used to derive the response cache key."""
+        if not self.access_token:
+            return None
+        return f"{self.access_token}:{self.master_key or ''}"
+
     def load_session(self, file_path, encryption_key):
         """Load session tokens and optionally the master key from a file."""
         with open(file_path, "r") as file:
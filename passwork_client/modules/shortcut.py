@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from ..crypto import encrypt_aes, decrypt_aes
-from ..utils import get_encryption_key, decrypt_and_save_item_attachment
+from ..utils import decrypt_and_save_item_attachment
+from ..deadline import Deadline
+from .batch import BATCH_SIZE
 
 class Shortcut:
     """
@@ -11,13 +14,8 @@ class Shortcut:
 
         encrypted_key = None
         if self.is_encrypt:
-            password_encrypted_key = get_encryption_key(
-                password["vaultMasterKeyEncrypted"],
-                password["keyEncrypted"],
-                self.user_private_key
-            )
-            vault = self.get_vault(vault_id)
-            vault_password = self.get_vault_password(vault)
+            password_encrypted_key = self.get_item_key(password)
+            vault_password = self.get_vault_key(vault_id)
             encrypted_key = encrypt_aes(password_encrypted_key, vault_password)
 
         shortcut = {
@@ -29,19 +27,79 @@ class Shortcut:
 
         response = self.call("POST", "/api/v1/shortcuts", shortcut)
 
+        self._invalidate_cached_searches()
         return response["id"]
 
-    def get_shortcut(self, shortcut_id: str):
-        shortcut = self.call("GET", f"/api/v1/shortcuts/{shortcut_id}")
-        shortcut["password"] = self.get_item(shortcut["id"])
+    def create_shortcuts(self, shortcuts: list[dict], deadline = None) -> list[dict]:
+        """
+        Create many shortcuts, e.g. to share credentials into a team vault.
+
+        Each shortcut is a dict with "itemId", "vaultId" and optionally "folderId". The
+        source items are fetched in batches (only their keys are decrypted), each vault key
+        is unlocked once, and the shortcuts are created through batch requests. Returns one
+        result per shortcut, in input order: {"index", "id", "error"}.
+        """
+        deadline = Deadline.coerce(deadline)
+        results = [{"index": index, "id": None, "error": None} for index in range(len(shortcuts))]
+
+        item_keys = {}
+        if self.is_encrypt:
+            item_ids = list(dict.fromkeys(shortcut["itemId"] for shortcut in shortcuts))
+            items, item_errors = {}, {}
+            for i in range(0, len(item_ids), BATCH_SIZE):
+                batch_items, batch_errors = self.send_batch_by_key(
+                    {id: {"method": "GET", "relativeUrl": f"/api/v1/items/{id}"} for id in item_ids[i:i + BATCH_SIZE]}, deadline
+                )
+                items.update(batch_items)
+                item_errors.update(batch_errors)
+            for item_id, item_data in items.items():
+                try:
+                    item_keys[item_id] = self.get_item_key(item_data)
+                except Exception as e:
+                    item_errors[item_id] = e
+
+        requests = {}
+        for index, shortcut in enumerate(shortcuts):
+            try:
+                encrypted_key = None
+                if self.is_encrypt:
+                    if shortcut["itemId"] not in item_keys:
+                        raise item_errors[shortcut["itemId"]]
+                    encrypted_key = encrypt_aes(item_keys[shortcut["itemId"]], self.get_vault_key(shortcut["vaultId"]))
+            except Exception as e:
+                results[index]["error"] = e
+                continue
+            requests[index] = {"method": "POST", "relativeUrl": "/api/v1/shortcuts", "body": {
+                "vaultId": shortcut["vaultId"],
+                "folderId": shortcut.get("folderId"),
+                "itemId": shortcut["itemId"],
+                "keyEncrypted": encrypted_key
+            }}
+
+        indexes = list(requests)
+        for i in range(0, len(indexes), BATCH_SIZE):
+            responses, errors = self.send_batch_by_key({index: requests[index] for index in indexes[i:i + BATCH_SIZE]}, deadline)
+            for index, response in responses.items():
+                results[index]["id"] = response["id"]
+            for index, error in errors.items():
+                results[index]["error"] = error
+
+        if requests:
+            self._invalidate_cached_searches()
+        return results
+
+    def get_shortcut(self, shortcut_id: str, deadline = None):
+        deadline = Deadline.coerce(deadline)
+        shortcut = self.call("GET", f"/api/v1/shortcuts/{shortcut_id}", deadline = deadline)
+        shortcut["password"] = self.get_item(shortcut["id"], deadline)
         return shortcut
 
-    def download_shortcut_attachment(self, shortcut, download_path):
+    def download_shortcut_attachment(self, shortcut, download_path, deadline = None):
         password = shortcut["password"]
-        return self.download_item_attachment(password, download_path)
+        return self.download_item_attachment(password, download_path, deadline)
 
     def search_shortcut(self, query: str = None, tags: list[str] = None, color_codes: list[int] = None, url: str = None,
-                       vault_ids: list[str] = None, folder_ids: list[str] = None):
+                       vault_ids: list[str] = None, folder_ids: list[str] = None, deadline = None):
         payload = {}
         if query is not None:
             payload["query"] = query
@@ -56,44 +114,122 @@ class Shortcut:
         if folder_ids is not None:
             payload["folderIds"] = folder_ids
 
+        if self.response_cache:
+            cache_key = self._search_cache_key("shortcuts", payload)
+            cached_results = self.response_cache.get(cache_key)
+            if cached_results is not None:
+                return cached_results
+
         # Make the request using the call method which will handle array formatting
-        search_results = self.call("GET", "/api/v1/shortcuts/search", payload)
+        search_results = self.call("GET", "/api/v1/shortcuts/search", payload, deadline = deadline)
+
+        if self.response_cache:
+            self.response_cache.set(cache_key, search_results.get("items", []))
+
         return search_results.get("items", [])
 
+    def search_shortcut_sharded(self, query: str = None, tags: list[str] = None, color_codes: list[int] = None, url: str = None,
+                                vault_ids: list[str] = None, folder_ids: list[str] = None, shard_size: int = 50,
+                                max_workers: int = 8, deadline = None):
+        """Search shortcuts with large vault or folder filters, see Item.search_items_sharded."""
+        return self._fan_out_search(self.search_shortcut, lambda item: item["shortcut"]["id"], query, tags, color_codes,
+                                    url, vault_ids, folder_ids, shard_size, max_workers, deadline)
+
     def search_and_decrypt_shortcut(self, query: str = None, tags: list[str] = None, color_codes: list[int] = None, url: str = None,
-                                    vault_ids: list[str] = None, folder_ids: list[str] = None):
-        search_results = self.search_shortcut(query, tags, color_codes, url, vault_ids, folder_ids)
+                                    vault_ids: list[str] = None, folder_ids: list[str] = None, deadline = None,
+                                    shard_size: int = None):
+        deadline = Deadline.coerce(deadline)
+        if shard_size:
+            search_results = self.search_shortcut_sharded(query, tags, color_codes, url, vault_ids, folder_ids,
+                                                          shard_size, deadline = deadline)
+        else:
+            search_results = self.search_shortcut(query, tags, color_codes, url, vault_ids, folder_ids, deadline)
 
-        # Extract item IDs from search results
-        item_ids = [item["shortcut"]["id"] for item in search_results]
+        # Search results carry the item IDs, so shortcuts and items are fetched in the same batches
+        return self._get_shortcut_items_with_item_ids(search_results, deadline)
 
-        # Get and decrypt detailed information for all items
-        if item_ids:
-            return self.get_shortcut_items(item_ids)
-        else:
-            return []
+    def iter_search_shortcuts(self, query: str = None, tags: list[str] = None, color_codes: list[int] = None, url: str = None,
+                              vault_ids: list[str] = None, folder_ids: list[str] = None, page_size: int = 100, deadline = None):
+        """Search shortcuts and yield them with their decrypted items, `page_size` shortcuts at a time."""
+        deadline = Deadline.coerce(deadline)
+        search_results = self.search_shortcut(query, tags, color_codes, url, vault_ids, folder_ids, deadline)
+        yield from self._iter_pages(
+            search_results, lambda page: self._get_shortcut_items_with_item_ids(page, deadline), page_size
+        )
 
-    def get_shortcut_items(self, item_ids: list[str]):
+    def get_shortcut_items(self, item_ids: list[str], deadline = None):
 
         if not item_ids:
             return []
 
-        requests = []
-        for id in item_ids:
-            requests.append({
-                "method": "GET",
-                "relativeUrl": f"/api/v1/shortcuts/{id}",
-            })
+        deadline = Deadline.coerce(deadline)
+        item_ids = list(item_ids)
 
-        shortcuts = self.send_batch(requests)
+        # The items of each batch of shortcuts are fetched while the next batch of shortcuts is
+        shortcuts = []
+        futures = []
+        with ThreadPoolExecutor(max_workers = 1) as executor:
+            for i in range(0, len(item_ids), BATCH_SIZE):
+                requests = [{"method": "GET", "relativeUrl": f"/api/v1/shortcuts/{id}"} for id in item_ids[i:i + BATCH_SIZE]]
+                batch_shortcuts = self.send_batch(requests, deadline)
+                shortcuts.extend(batch_shortcuts)
+                futures.append(executor.submit(self.get_items, [shortcut["id"] for shortcut in batch_shortcuts], deadline))
+            items = [item for future in futures for item in future.result()]
 
         # Process each item in the response
         decrypted_items = {}
         for shortcut in shortcuts:
             decrypted_items[shortcut["id"]] = shortcut
 
-        items = self.get_items(decrypted_items.keys())
         for item in items:
             decrypted_items[item["id"]]["password"] = item
 
-        return list(decrypted_items.values())
\ No newline at end of file
+        return list(decrypted_items.values())
+
+    def _get_shortcut_items_with_item_ids(self, search_results: list[dict], deadline = None):
+        """
+        Fetch shortcuts together with their items, whose IDs search results already carry.
+
+        Shortcut and item requests share the same batches, so each batch is one round trip
+        instead of two sequential ones.
+        """
+        if not search_results:
+            return []
+
+        deadline = Deadline.coerce(deadline)
+        requests = {}
+        cached_items = {}
+        for result in search_results:
+            requests[("shortcut", result["shortcut"]["id"])] = {
+                "method": "GET", "relativeUrl": f"/api/v1/shortcuts/{result['shortcut']['id']}"
+            }
+            cached_item = self._get_cached_item(result["id"])
+            if cached_item is not None:
+                cached_items[result["id"]] = cached_item
+            else:
+                requests[("item", result["id"])] = {"method": "GET", "relativeUrl": f"/api/v1/items/{result['id']}"}
+
+        keys = list(requests)
+        shortcuts = {}
+        items = dict(cached_items)
+        for i in range(0, len(keys), BATCH_SIZE):
+            batch_keys = keys[i:i + BATCH_SIZE]
+            responses = self.batch_request_responses([requests[key] for key in batch_keys], deadline)
+            for (kind, id), response in zip(batch_keys, responses):
+                if response["statusCode"] != 200:
+                    continue
+                if kind == "shortcut":
+                    shortcuts[id] = response["body"]
+                else:
+                    items[id] = self._decrypt_fetched_item(response["body"])
+
+        decrypted_items = []
+        for result in search_results:
+            shortcut = shortcuts.get(result["shortcut"]["id"])
+            if shortcut is None:
+                continue
+            if result["id"] in items:
+                shortcut["password"] = items[result["id"]]
+            decrypted_items.append(shortcut)
+
+        return decrypted_items
@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+from ..deadline import Deadline
+from ..vault_replica import VaultReplica
+
+class Sync:
+    def sync_vaults(self, vault_ids: list[str], replica: VaultReplica, deadline = None) -> dict:
+        """
+        Bring a local replica of the given vaults up to date.
+
+        Item summaries of the vaults are listed and compared with the replica by
+        updatedAt; only added and changed items are fetched and decrypted, and items
+        that are gone are removed. Returns counts of added, updated, deleted and
+        unchanged items.
+        """
+        # One deadline is shared by the listing and the batch fetches
+        deadline = Deadline.coerce(deadline)
+
+        # The listing is not served from the response cache, it must reflect the server
+        summaries = self.call("GET", "/api/v1/items/search", {"vaultIds": vault_ids}, deadline = deadline)
+        summaries = summaries.get("items", [])
+
+        # Items of all vaults are compared at once, so items moved between them are not dropped
+        versions = replica.get_versions(vault_ids)
+        added_ids = []
+        updated_ids = []
+        for summary in summaries:
+            if summary["id"] not in versions:
+                added_ids.append(summary["id"])
+            elif summary.get("updatedAt") is None or summary["updatedAt"] != versions[summary["id"]]:
+                updated_ids.append(summary["id"])
+
+        listed_ids = {summary["id"] for summary in summaries}
+        deleted_ids = [item_id for item_id in versions if item_id not in listed_ids]
+
+        changed_items = self._fetch_items(added_ids + updated_ids, deadline) if added_ids or updated_ids else []
+
+        synced_at = datetime.now(timezone.utc).isoformat()
+        cursors = {}
+        for vault_id in vault_ids:
+            cursors[vault_id] = {
+                "syncedAt": synced_at,
+                "items": sum(1 for summary in summaries if summary.get("vaultId") == vault_id),
+            }
+
+        replica.apply(changed_items, deleted_ids, cursors)
+        replica.save()
+
+        return {
+            "added": len(added_ids),
+            "updated": len(updated_ids),
+            "deleted": len(deleted_ids),
+            "unchanged": len(summaries) - len(added_ids) - len(updated_ids),
+        }
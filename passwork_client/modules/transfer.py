@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor
+from ..crypto import encrypt_aes, decrypt_aes, generate_key
+from ..deadline import Deadline
+
+# Fields of an item that are copied as they are
+COPY_ITEM_FIELDS = ("name", "login", "url", "description", "tags", "color")
+
+class Transfer:
+    """
+    Bulk move and copy of items between vaults.
+
+    Passwords, custom fields and attachment keys of an item are encrypted with the item
+    key, and the item key is encrypted with the vault key. Items created by this client
+    use the vault key itself as item key, so the key is never handed to the target vault:
+    every moved or copied item gets a fresh item key, its password, custom fields and
+    attachment keys are re-encrypted with it, and the fresh key is encrypted with the
+    target vault key. Attachment data stays encrypted with the attachment keys, so it is
+    only downloaded for copies; moves keep it on the server.
+    """
+    def move_items(self, item_ids: list[str], vault_id: str, folder_id: str | None = None, chunk_size: int = 25,
+                   max_workers: int = 4, deadline = None) -> dict:
+        """
+        Move items to another vault (and folder).
+
+        Returns:
+            dict: {"moved": [item IDs], "failed": {item ID: error}}
+        """
+        moved, failed = self._transfer_items(item_ids, vault_id, folder_id, False, chunk_size, max_workers, deadline)
+        return {"moved": list(moved), "failed": failed}
+
+    def copy_items(self, item_ids: list[str], vault_id: str, folder_id: str | None = None, chunk_size: int = 25,
+                   max_workers: int = 4, deadline = None) -> dict:
+        """
+        Copy items, including their attachments, to another vault (and folder).
+
+        Returns:
+            dict: {"copied": {source item ID: new item ID}, "failed": {item ID: error}}
+        """
+        copied, failed = self._transfer_items(item_ids, vault_id, folder_id, True, chunk_size, max_workers, deadline)
+        return {"copied": copied, "failed": failed}
+
+    def _transfer_items(self, item_ids, vault_id, folder_id, is_copy, chunk_size, max_workers, deadline):
+        deadline = Deadline.coerce(deadline)
+        done, failed = {}, {}
+
+        # The target vault key is unlocked once for all items
+        vault_password = self.get_vault_key(vault_id)
+
+        with ThreadPoolExecutor(max_workers = max_workers) as executor:
+            for i in range(0, len(item_ids), chunk_size):
+                chunk_done, chunk_failed = self._transfer_chunk(
+                    item_ids[i:i + chunk_size], vault_id, folder_id, vault_password, is_copy, executor, deadline
+                )
+                done.update(chunk_done)
+                failed.update(chunk_failed)
+
+        return done, failed
+
+    def _transfer_chunk(self, item_ids, vault_id, folder_id, vault_password, is_copy, executor, deadline):
+        items, failed = self.send_batch_by_key(
+            {id: {"method": "GET", "relativeUrl": f"/api/v1/items/{id}"} for id in item_ids}, deadline
+        )
+
+        # Unlock each source vault key once before the workers need it
+        source_vaults = {item_data.get("vaultId"): item_data for item_data in items.values()}
+        for item_data in source_vaults.values():
+            try:
+                self.get_item_key(item_data)
+            except Exception:
+                # Reported per item by the workers
+                pass
+
+        def prepare(item_data):
+            try:
+                body = {"vaultId": vault_id, "folderId": folder_id}
+                if is_copy:
+                    body.update({field: item_data[field] for field in COPY_ITEM_FIELDS if field in item_data})
+                attachments = []
+                for attachment in item_data.get("attachments") or []:
+                    if not is_copy:
+                        # A move keeps the attachment data, the item data holds the attachment keys
+                        attachments.append({"id": attachment["id"], "encryptedKey": attachment["encryptedKey"]})
+                        continue
+                    attachment_data = self.get_item_attachment(item_data["id"], attachment["id"], deadline)
+                    attachments.append({
+                        "id": attachment["id"],
+                        "name": attachment_data.get("name", attachment.get("name")),
+                        "encryptedKey": attachment_data["encryptedKey"],
+                        "encryptedData": attachment_data["encryptedData"],
+                        "hash": attachment_data["hash"],
+                    })
+
+                if self.is_encrypt:
+                    item_key, new_key = self.get_item_key(item_data), generate_key()
+                    body.update(self._reencrypt_item_fields(item_data, item_key, new_key))
+                    body["keyEncrypted"] = encrypt_aes(new_key, vault_password)
+                    for attachment in attachments:
+                        attachment["encryptedKey"] = encrypt_aes(decrypt_aes(attachment["encryptedKey"], item_key), new_key)
+                else:
+                    body.update({field: item_data[field] for field in ("passwordEncrypted", "customs") if field in item_data})
+                    body["keyEncrypted"] = encrypt_aes(self.get_item_key(item_data), vault_password)
+
+                if is_copy and attachments:
+                    # Attachment data stays encrypted with the attachment keys
+                    body["attachments"] = [
+                        {field: attachment[field] for field in ("name", "encryptedKey", "encryptedData", "hash")}
+                        for attachment in attachments
+                    ]
+                elif attachments:
+                    # Moved attachments keep their data, only their keys are replaced
+                    body["attachments"] = [
+                        {"id": attachment["id"], "encryptedKey": attachment["encryptedKey"]}
+                        for attachment in attachments
+                    ]
+                return body, None
+            except Exception as e:
+                return None, e
+
+        requests = {}
+        for item_id, (body, error) in zip(items, executor.map(prepare, items.values())):
+            if error is not None:
+                failed[item_id] = error
+            elif is_copy:
+                requests[item_id] = {"method": "POST", "relativeUrl": "/api/v1/items", "body": body}
+            else:
+                requests[item_id] = {"method": "PATCH", "relativeUrl": f"/api/v1/items/{item_id}", "body": body}
+
+        if not requests:
+            return {}, failed
+
+        responses, errors = self.send_batch_by_key(requests, deadline)
+        failed.update(errors)
+        if is_copy:
+            self._invalidate_cached_searches()
+
+        done = {}
+        for item_id, response in responses.items():
+            if is_copy:
+                done[item_id] = response["id"]
+                if self.search_index is not None and item_id in self.search_index:
+                    copied_item = self.search_index.get(item_id)
+                    self.search_index.add({**copied_item, "id": response["id"], "vaultId": vault_id, "folderId": folder_id})
+            else:
+                done[item_id] = item_id
+                self._invalidate_cached_item(item_id)
+                if self.search_index is not None:
+                    self.search_index.update(item_id, {"vaultId": vault_id, "folderId": folder_id})
+
+        return done, failed
+
+    @staticmethod
+    def _reencrypt_item_fields(item_data: dict, item_key: str, new_key: str) -> dict:
+        """Re-encrypt the password and custom fields of an item with a new item key."""
+        fields = {}
+        if item_data.get("passwordEncrypted"):
+            fields["passwordEncrypted"] = encrypt_aes(decrypt_aes(item_data["passwordEncrypted"], item_key), new_key)
+        if item_data.get("customs"):
+            fields["customs"] = [
+                {
+                    **custom,
+                    **{
+                        field: encrypt_aes(decrypt_aes(custom[field], item_key), new_key)
+                        for field in ("name", "type", "value") if field in custom
+                    },
+                }
+                for custom in item_data["customs"]
+            ]
+        return fields
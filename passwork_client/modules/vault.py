@@ -1,4 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
 from ..crypto import rsa_decrypt, rsa_encrypt, get_hash, b64encode, generate_key, generate_salt
+from ..deadline import Deadline
 
 class Vault:
 
@@ -19,11 +21,64 @@ class Vault:
         return response["id"]
 
     def get_vault(self, vault_id: str):
+        # Concurrent requests for the same vault share one fetch
+        if self.single_flight:
+            return self.single_flight.do(("get_vault", vault_id), lambda: self.call("GET", f"/api/v1/vaults/{vault_id}"))
         return self.call("GET", f"/api/v1/vaults/{vault_id}")
 
     def get_vault_password(self, vault: dict):
         if not self.is_encrypt:
             return ''
 
+        # Decrypted vault master keys are kept in the key ring, keyed by vault ID
+        vault_id = vault.get("id")
+        if vault_id and vault_id in self.vault_keys:
+            return self.vault_keys[vault_id]
+
         vault_key_encrypted = vault["masterKeyEncrypted"]
-        return rsa_decrypt(vault_key_encrypted, self.user_private_key).decode()
+        vault_password = rsa_decrypt(vault_key_encrypted, self.get_private_key()).decode()
+        if vault_id:
+            self.vault_keys[vault_id] = vault_password
+        return vault_password
+
+    def get_vault_key(self, vault_id: str):
+        """Get the decrypted master key of a vault, fetching the vault only if it is not in the key ring."""
+        if not self.is_encrypt:
+            return ''
+        if vault_id in self.vault_keys:
+            return self.vault_keys[vault_id]
+        return self.get_vault_password(self.get_vault(vault_id))
+
+    def get_vaults(self, deadline = None):
+        response = self.call("GET", "/api/v1/vaults", deadline = deadline)
+        return response.get("items", []) if isinstance(response, dict) else response
+
+    def warm_up(self, max_workers: int = 8, deadline = None):
+        """
+        Load the master keys of all vaults of the user into the key ring.
+
+        Vaults are listed once (vaults listed without their encrypted master key are
+        fetched in one batch) and the keys are decrypted in parallel. Long-running services
+        can call this at boot, so that user-facing requests skip the vault fetch and the
+        RSA decryption.
+
+        Returns:
+            list: IDs of the vaults whose keys are in the key ring
+        """
+        if not self.is_encrypt:
+            return []
+
+        deadline = Deadline.coerce(deadline)
+        vaults = self.get_vaults(deadline)
+
+        incomplete_ids = [vault["id"] for vault in vaults if not vault.get("masterKeyEncrypted")]
+        if incomplete_ids:
+            requests = [{"method": "GET", "relativeUrl": f"/api/v1/vaults/{id}"} for id in incomplete_ids]
+            vaults = [vault for vault in vaults if vault.get("masterKeyEncrypted")]
+            vaults.extend(self.send_batch(requests, deadline))
+
+        vaults = [vault for vault in vaults if vault["id"] not in self.vault_keys]
+        with ThreadPoolExecutor(max_workers = max_workers) as executor:
+            list(executor.map(self.get_vault_password, vaults))
+
+        return list(self.vault_keys.keys())
@@ -8,23 +8,53 @@ from .modules.master_key import MasterKeyManager
 from .modules.session import SessionManager
 from .modules.link import Link
 from .modules.batch import Batch
+from .modules.sync import Sync
+from .modules.bulk import Bulk
+from .modules.export import Export
+from .modules.rotation import Rotation
+from .modules.transfer import Transfer
+from .modules.reconcile import Reconcile
 from .exceptions import PassworkError
+from .hedging import HedgePolicy
+from .endpoints import EndpointPool
+from .circuit_breaker import CircuitBreaker
+from .single_flight import SingleFlight
+from .item_cache import ItemCache
+from .response_cache import ResponseCache
 import urllib3
 from urllib3.exceptions import InsecureRequestWarning
 
 # Suppress SSL certificate verification warnings globally
 urllib3.disable_warnings(InsecureRequestWarning)
 
-class PassworkClient(ApiClient, MasterKeyManager, SessionManager, Item, Vault, Inbox, User, Shortcut, Link, Batch):
+class PassworkClient(ApiClient, MasterKeyManager, SessionManager, Item, Vault, Inbox, User, Shortcut, Link, Batch, Sync, Bulk, Export, Rotation, Transfer, Reconcile):
     """
     A client for interacting with the Passwork API.
     """
-    def __init__(self, host: str, verify_ssl: bool = True, auto_refresh: bool = False):
+    def __init__(self, host: str | list[str], verify_ssl: bool = True, auto_refresh: bool = False,
+                 connect_timeout: float | None = 10.0, read_timeout: float | None = 60.0,
+                 hedge_delay: float | None = None, hedge_budget: float = 0.1,
+                 circuit_failure_threshold: int | None = None, circuit_reset_timeout: float = 30.0,
+                 on_circuit_state_change = None, coalesce_requests: bool = False,
+                 item_cache: ItemCache | None = None, response_cache: ResponseCache | None = None):
         if not host:
             raise PassworkError("Host must be specified", "host_not_specified")
 
         # Initialize ApiClient variables
-        self.host = host.rstrip('/')  # Ensure no trailing slash
+        # A list of hosts enables failover and latency-aware load balancing between them
+        self.hosts = [h.rstrip('/') for h in host] if isinstance(host, (list, tuple)) else [host.rstrip('/')]
+        if not all(self.hosts):
+            raise PassworkError("Host must be specified", "host_not_specified")
+        self.host = self.hosts[0]  # Primary host
+        # Per-host circuit breakers are opt-in, enabled by setting a failure threshold
+        breaker_factory = None
+        if circuit_failure_threshold:
+            breaker_factory = lambda url: CircuitBreaker(
+                url, circuit_failure_threshold, circuit_reset_timeout, on_circuit_state_change
+            )
+        self.endpoints = EndpointPool(self.hosts, breaker_factory = breaker_factory)
+        # Coalescing of concurrent identical GET requests and item/vault lookups is opt-in
+        self.single_flight = SingleFlight() if coalesce_requests else None
         self.verify_ssl = verify_ssl
 
         # Disable SSL warnings only if verify_ssl is explicitly set to False
@@ -35,14 +65,31 @@ class PassworkClient(ApiClient, MasterKeyManager, SessionManager, Item, Vault, I
         self.refresh_token = None
         self.master_key_hash = None
         self.auto_refresh = auto_refresh
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # Hedging of GET requests is opt-in, enabled by setting a delay (e.g. the observed p95)
+        self.hedging = HedgePolicy(hedge_delay, hedge_budget) if hedge_delay is not None else None
+        self._init_transport()
         
         # Initialize MasterKeyManager variables
         self.master_key = None
         self.user_private_key = None
+        self.parsed_private_key = None  # (PEM, key) of user_private_key, see get_private_key
         self.user_public_key = None
         self.mk_options = None
         self.is_encrypt = False
         
+        # Initialize Item variables
+        self.item_cache = item_cache
+        self.search_index = None  # Local search index, see build_search_index
+        # Persistent cache shared between processes, encrypted with a key derived from the session
+        self.response_cache = response_cache
+        if self.response_cache:
+            self.response_cache.bind(self.get_session_secret)
+
+        # Initialize Vault variables
+        self.vault_keys = {}  # Key ring of decrypted vault master keys
+
         # Initialize SessionManager variables
         self.session_path = None
         self.session_encryption_key = None 
\ No newline at end of file
@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+from .crypto import encrypt_aes, decrypt_aes
+
+class ResponseCache:
+    """
+    Persistent cache of decrypted items and search results, shared between processes.
+
+    Entries are stored in a SQLite database and encrypted at rest with a key derived from
+    the client session (access token and master key), so a different session can neither
+    read them nor even look them up. Entries expire after `ttl` seconds; once the database
+    holds more than `max_bytes` of entries, the least recently used ones are removed.
+
+    Errors of the cache itself (unreadable file, foreign entries) are treated as misses.
+    """
+    def __init__(self, path: str, ttl: float = 300.0, max_bytes: int = 50 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.secret_provider = None
+        self.secret = None
+        self.passphrase = None
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode = 0o700, exist_ok = True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+        os.chmod(path, 0o600)
+
+    def bind(self, secret_provider):
+        """Set the callable returning the session secret the encryption key is derived from."""
+        self.secret_provider = secret_provider
+
+    @contextmanager
+    def _connect(self):
+        # A connection per operation keeps the cache safe to use from threads and forked processes
+        connection = sqlite3.connect(self.path, timeout = 5)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _get_passphrase(self):
+        secret = self.secret_provider() if self.secret_provider else None
+        if not secret:
+            return None
+        if secret != self.secret:
+            self.secret = secret
+            self.passphrase = hashlib.sha256(f"passwork-response-cache:{secret}".encode()).hexdigest()
+        return self.passphrase
+
+    @staticmethod
+    def _entry_key(passphrase: str, key: str) -> str:
+        return hashlib.sha256(f"{passphrase}:{key}".encode()).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached value for `key`, or None."""
+        passphrase = self._get_passphrase()
+        if not passphrase:
+            return None
+
+        entry_key = self._entry_key(passphrase, key)
+        now = time.time()
+        try:
+            with self._connect() as connection:
+                row = connection.execute(
+                    "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (entry_key, now)
+                ).fetchone()
+                if row is None:
+                    return None
+                connection.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, entry_key))
+        except sqlite3.Error:
+            return None
+
+        try:
+            return json.loads(decrypt_aes(row[0], passphrase))
+        except Exception:
+            # Corrupted entry, drop it
+            self.invalidate(key)
+            return None
+
+    def set(self, key: str, value):
+        passphrase = self._get_passphrase()
+        if not passphrase:
+            return
+
+        encrypted = encrypt_aes(json.dumps(value), passphrase)
+        now = time.time()
+        try:
+            with self._connect() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (self._entry_key(passphrase, key), encrypted, len(encrypted), now + self.ttl, now)
+                )
+                self._evict(connection, now)
+        except sqlite3.Error:
+            pass
+
+    def invalidate(self, key: str):
+        passphrase = self._get_passphrase()
+        if not passphrase:
+            return
+        try:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM entries WHERE key = ?", (self._entry_key(passphrase, key),))
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM entries")
+
+    def _evict(self, connection, now: float):
+        connection.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = connection.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+        for entry_key, size in rows:
+            if total <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM entries WHERE key = ?", (entry_key,))
+            total -= size
@@ -0,0 +1,152 @@
+import re
+import copy
+import bisect
+import threading
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+def _tokenize(*values) -> set[str]:
+    tokens = set()
+    for value in values:
+        if isinstance(value, str):
+            tokens.update(token.lower() for token in _TOKEN_PATTERN.findall(value))
+    return tokens
+
+class SearchIndex:
+    """
+    Local inverted index over decrypted items.
+
+    Names, logins, URLs and tags are split into lowercase words; a query matches items
+    that have, for every word of the query, a word starting with it. Tags, colour codes,
+    vaults and folders are indexed separately and filter the results. The index can be
+    updated incrementally with `add` and `remove`.
+
+    The indexed items are kept in memory as they were given, including decrypted secrets.
+    """
+    def __init__(self, items: list[dict] = None):
+        self.items = {}
+        self.words = {}
+        self.tags = {}
+        self.colors = {}
+        self.vaults = {}
+        self.folders = {}
+        self.sorted_words = []
+        self.is_sorted = True
+        self.lock = threading.RLock()
+        for item in items or []:
+            self.add(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item_id):
+        return item_id in self.items
+
+    def get(self, item_id: str) -> dict | None:
+        with self.lock:
+            return copy.deepcopy(self.items.get(item_id))
+
+    def _after_fork(self):
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def _postings(item: dict):
+        """Yield (index name, key) pairs an item is indexed under."""
+        for word in _tokenize(item.get("name"), item.get("login"), item.get("url"), *(item.get("tags") or [])):
+            yield "words", word
+        for tag in item.get("tags") or []:
+            yield "tags", tag.lower()
+        if item.get("color") is not None:
+            yield "colors", item["color"]
+        if item.get("vaultId"):
+            yield "vaults", item["vaultId"]
+        if item.get("folderId"):
+            yield "folders", item["folderId"]
+
+    def add(self, item: dict):
+        """Add an item, replacing an indexed item with the same ID."""
+        with self.lock:
+            self.remove(item["id"])
+            self.items[item["id"]] = copy.deepcopy(item)
+            for index_name, key in self._postings(item):
+                index = getattr(self, index_name)
+                if index_name == "words" and key not in index:
+                    self.is_sorted = False
+                index.setdefault(key, set()).add(item["id"])
+
+    def update(self, item_id: str, changes: dict):
+        """Apply changed fields to an indexed item and re-index it."""
+        with self.lock:
+            if item_id in self.items:
+                self.add({**self.items[item_id], **changes, "id": item_id})
+
+    def remove(self, item_id: str):
+        with self.lock:
+            item = self.items.pop(item_id, None)
+            if item is None:
+                return
+            for index_name, key in self._postings(item):
+                index = getattr(self, index_name)
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(item_id)
+                    if not ids:
+                        del index[key]
+                        if index_name == "words":
+                            self.is_sorted = False
+
+    def _prefix_matches(self, prefix: str) -> set[str]:
+        if not self.is_sorted:
+            self.sorted_words = sorted(self.words)
+            self.is_sorted = True
+
+        ids = set()
+        position = bisect.bisect_left(self.sorted_words, prefix)
+        while position < len(self.sorted_words) and self.sorted_words[position].startswith(prefix):
+            ids |= self.words[self.sorted_words[position]]
+            position += 1
+        return ids
+
+    @staticmethod
+    def _any_of(index: dict, keys) -> set[str]:
+        ids = set()
+        for key in keys:
+            ids |= index.get(key, set())
+        return ids
+
+    def search(self, query: str = None, tags: list[str] = None, color_codes: list[int] = None, url: str = None,
+               vault_ids: list[str] = None, folder_ids: list[str] = None) -> list[dict]:
+        """
+        Search the index with the filters of Item.search_items.
+
+        Every given filter must match; list filters match any of their values.
+        Returns copies of the matching items ordered by name.
+        """
+        with self.lock:
+            candidates = None
+
+            def narrow(ids):
+                nonlocal candidates
+                candidates = ids if candidates is None else candidates & ids
+
+            for word in _tokenize(query):
+                narrow(self._prefix_matches(word))
+            if tags:
+                narrow(self._any_of(self.tags, [tag.lower() for tag in tags]))
+            if color_codes:
+                narrow(self._any_of(self.colors, color_codes))
+            if vault_ids:
+                narrow(self._any_of(self.vaults, vault_ids))
+            if folder_ids:
+                narrow(self._any_of(self.folders, folder_ids))
+
+            if candidates is None:
+                candidates = set(self.items)
+            results = [self.items[id] for id in candidates]
+
+        if url:
+            url = url.lower()
+            results = [item for item in results if url in (item.get("url") or "").lower()]
+
+        results.sort(key = lambda item: (item.get("name") or "").lower())
+        return copy.deepcopy(results)
@@ -0,0 +1,60 @@
+import copy
+import threading
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.followers = 0
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalescing of concurrent identical calls.
+
+    While a call for a key is in flight, other threads asking for the same key wait for
+    it and share its outcome instead of doing the work again. Results are returned as
+    deep copies, so callers can modify them (e.g. decrypt fields in place) independently.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def _after_fork(self):
+        # Calls in flight belong to threads of the parent process and never finish here
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn):
+        """Run `fn` for `key`, or wait for the identical call that is already running."""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+            else:
+                call.followers += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.error = e
+            self._finish(key, call)
+            raise
+
+        self._finish(key, call, result)
+        return result
+
+    def _finish(self, key, call, result = None):
+        with self.lock:
+            del self.calls[key]
+            if call.followers and call.error is None:
+                # Snapshot before the leader's caller gets a chance to modify the result
+                call.result = copy.deepcopy(result)
+        call.event.set()
@@ -1,8 +1,10 @@
 import os
+import json
 import base64
 import re
 import hashlib
 from pathlib import Path
+from datetime import datetime
 from .crypto import encrypt_aes, generate_string, decrypt_aes, rsa_decrypt
 
 def is_valid_totp(totp_value: str):
@@ -129,4 +131,27 @@ def save_attachment(byte_data_content: bytes, filename: str, download_path: str)
     Path(download_path).mkdir(parents=True, exist_ok=True)
     download_path = os.path.join(download_path, filename)
     with open(download_path, "wb") as file:
-        file.write(byte_data_content)
\ No newline at end of file
+        file.write(byte_data_content)
+
+def parse_timestamp(value) -> float | None:
+    """Turn an ISO timestamp or a Unix time of the API into a Unix time."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+def item_fingerprint(item: dict, desired: dict) -> str:
+    """Hash of the fields of an item that `desired` sets, to compare an item with desired data."""
+    managed = {}
+    for field in desired:
+        if field in ("vaultId", "attachments"):
+            continue
+        value = item.get(field)
+        if field == "customs":
+            value = [[c.get("name"), c.get("type"), c.get("value")] for c in value or []]
+        managed[field] = value
+    return hashlib.sha256(json.dumps(managed, sort_keys = True, default = str).encode()).hexdigest()
@@ -0,0 +1,91 @@
+import os
+import copy
+import json
+import base64
+import threading
+from .crypto import encrypt_aes, decrypt_aes
+
+class VaultReplica:
+    """
+    Local encrypted replica of decrypted vault items, kept current by PassworkClient.sync_vaults.
+
+    The replica is stored in a single file encrypted with `encryption_key`, in the same
+    format as a saved session. Besides the items it holds a sync cursor per vault (the time
+    of the last sync and the number of items), so reads never need the server.
+    """
+    def __init__(self, path: str, encryption_key: str):
+        self.path = path
+        self.encryption_key = encryption_key
+        self.items = {}
+        self.cursors = {}
+        self.lock = threading.RLock()
+        if os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item_id):
+        return item_id in self.items
+
+    def _after_fork(self):
+        self.lock = threading.RLock()
+
+    def load(self):
+        with open(self.path, "r") as file:
+            encrypted_data = file.read()
+
+        data = json.loads(decrypt_aes(base64.b64decode(encrypted_data).decode("utf-8"), self.encryption_key))
+        with self.lock:
+            self.items = data["items"]
+            self.cursors = data["cursors"]
+
+    def save(self):
+        """Write the replica atomically, readable by the owner only."""
+        with self.lock:
+            data = json.dumps({"items": self.items, "cursors": self.cursors})
+
+        encrypted = encrypt_aes(data, self.encryption_key)
+        encrypted_data = base64.b64encode(encrypted.encode("utf-8"))
+
+        temp_path = f"{self.path}.tmp"
+        file_descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(file_descriptor, "w") as file:
+            file.write(encrypted_data.decode("utf-8"))
+        os.replace(temp_path, self.path)
+
+    def get_item(self, item_id: str) -> dict | None:
+        with self.lock:
+            item = self.items.get(item_id)
+            return copy.deepcopy(item)
+
+    def get_items(self, vault_ids: list[str] = None) -> list[dict]:
+        """Return copies of the replicated items, optionally of the given vaults only."""
+        with self.lock:
+            items = [
+                item for item in self.items.values()
+                if vault_ids is None or item.get("vaultId") in vault_ids
+            ]
+            return copy.deepcopy(items)
+
+    def get_cursor(self, vault_id: str) -> dict | None:
+        with self.lock:
+            cursor = self.cursors.get(vault_id)
+            return dict(cursor) if cursor is not None else None
+
+    def get_versions(self, vault_ids: list[str]) -> dict:
+        """Map the IDs of replicated items of the given vaults to their updatedAt."""
+        with self.lock:
+            return {
+                item_id: item.get("updatedAt") for item_id, item in self.items.items()
+                if item.get("vaultId") in vault_ids
+            }
+
+    def apply(self, changed_items: list[dict], deleted_ids: list[str], cursors: dict):
+        """Apply the result of a sync."""
+        with self.lock:
+            for item_id in deleted_ids:
+                self.items.pop(item_id, None)
+            for item in changed_items:
+                self.items[item["id"]] = item
+            self.cursors.update(cursors)
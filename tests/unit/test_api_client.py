@@ -0,0 +1,502 @@
+import os
+import time
+import threading
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+from passwork_client import PassworkClient
+from passwork_client.modules import api_client
+from passwork_client.deadline import Deadline
+from passwork_client.hedging import HedgePolicy
+from passwork_client.endpoints import EndpointPool
+from passwork_client.circuit_breaker import CircuitBreaker
+from passwork_client.enums import CircuitState
+from passwork_client.single_flight import SingleFlight
+from passwork_client.exceptions import PassworkError
+
+class TestApiClient:
+
+    @pytest.fixture
+    def client(self):
+        """Create a client with a mocked HTTP session."""
+        client = PassworkClient('https://mock-passwork-api.com')
+        client.http_session = MagicMock()
+        return client
+
+    def test_requests_use_pooled_session(self, client, mock_response):
+        """Requests go through the client's HTTP session."""
+        client.http_session.request.return_value = mock_response(200, {"id": "1"})
+
+        result = client.call("GET", "/api/v1/items/1")
+
+        assert result == {"id": "1"}
+        assert client.http_session.request.call_args.args == ("GET", "https://mock-passwork-api.com/api/v1/items/1")
+
+    def test_reset_after_fork_keeps_keys(self, client):
+        """A forked child gets a fresh pool and locks but keeps unlocked key material."""
+        client.master_key = "mock_master_key"
+        client.user_private_key = "mock_private_key"
+        client.is_encrypt = True
+        session, lock = client.http_session, client.token_lock
+
+        api_client._reset_clients_after_fork()
+
+        assert client.http_session is not session
+        assert client.token_lock is not lock
+        assert client.master_key == "mock_master_key"
+        assert client.user_private_key == "mock_private_key"
+        assert client.is_encrypt
+
+    def test_pid_change_resets_transport(self, client, mock_response):
+        """Without fork hooks, a pid change is detected on the next request."""
+        client.pid = -1
+
+        with patch('passwork_client.modules.api_client.requests.Session') as session_class:
+            session_class.return_value.request.return_value = mock_response(200, {})
+            client.call("GET", "/api/v1/vaults")
+
+        assert client.pid == os.getpid()
+        session_class.return_value.request.assert_called_once()
+
+    def test_expired_token_refreshed_once(self, client, mock_response):
+        """A request that raced with another thread's refresh reuses the new token."""
+        client.auto_refresh = True
+        client.set_tokens("old_token", "refresh_token")
+        client.update_tokens = MagicMock()
+        client.access_token = "new_token"
+
+        client._refresh_expired_token("Bearer old_token")
+
+        client.update_tokens.assert_not_called()
+
+    def test_client_timeouts_passed_to_requests(self, client, mock_response):
+        """Every request carries the client-wide connect/read timeouts."""
+        client.connect_timeout, client.read_timeout = 3.0, 15.0
+        client.http_session.request.return_value = mock_response(200, {})
+
+        client.call("GET", "/api/v1/vaults")
+
+        assert client.http_session.request.call_args.kwargs["timeout"] == (3.0, 15.0)
+
+    def test_deadline_caps_timeouts(self, client, mock_response):
+        """The remaining deadline caps the per-request timeouts."""
+        client.http_session.request.return_value = mock_response(200, {})
+
+        client.call("GET", "/api/v1/vaults", deadline=0.5)
+
+        connect, read = client.http_session.request.call_args.kwargs["timeout"]
+        assert 0 < connect <= 0.5
+        assert 0 < read <= 0.5
+
+    def test_expired_deadline_fails_fast(self, client):
+        """No request is sent once the deadline has passed."""
+        deadline = Deadline(0)
+
+        with pytest.raises(PassworkError) as e:
+            client.call("GET", "/api/v1/vaults", deadline=deadline)
+
+        assert e.value.code == "deadline_exceeded"
+        client.http_session.request.assert_not_called()
+
+    def test_timeout_raises_passwork_error(self, client):
+        """A timed out request surfaces as a PassworkError."""
+        client.http_session.request.side_effect = requests.Timeout()
+
+        with pytest.raises(PassworkError) as e:
+            client.call("GET", "/api/v1/vaults")
+
+        assert e.value.code == "request_timeout"
+
+    def test_batch_shares_one_deadline(self, client, mock_response):
+        """All batch chunks of get_items spend the same deadline."""
+        client.http_session.request.return_value = mock_response(200, {"responses": []})
+
+        with patch.object(client, "batch_request", wraps=client.batch_request) as batch_request:
+            client.get_items([str(i) for i in range(30)], deadline=5)
+
+        deadlines = [call.args[1] for call in batch_request.call_args_list]
+        assert len(deadlines) == 2
+        assert deadlines[0] is deadlines[1]
+
+class TestHedgePolicy:
+
+    def _response(self, status_code=200):
+        response = MagicMock()
+        response.status_code = status_code
+        return response
+
+    def test_fast_response_not_hedged(self):
+        """Requests that answer within the delay are sent once."""
+        policy = HedgePolicy(delay=1.0)
+        send = MagicMock(return_value=self._response())
+
+        policy.send(send)
+
+        assert send.call_count == 1
+        assert policy.stats["hedges_sent"] == 0
+
+    def test_slow_response_hedged(self):
+        """A slow request is hedged and the faster duplicate wins."""
+        policy = HedgePolicy(delay=0.01)
+        slow, fast = self._response(), self._response()
+        release = threading.Event()
+        calls = []
+
+        def send():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(2)
+                return slow
+            return fast
+
+        assert policy.send(send) is fast
+        release.set()
+
+        assert policy.stats["hedges_sent"] == 1
+        assert policy.stats["hedges_won"] == 1
+
+    def test_budget_bounds_hedges(self):
+        """No hedge is sent once the budget is spent."""
+        policy = HedgePolicy(delay=0.0, budget=0.0, max_burst=0.0)
+        send = MagicMock(return_value=self._response())
+
+        policy.send(send)
+
+        assert send.call_count == 1
+        assert policy.stats["hedges_sent"] == 0
+
+    def test_busy_pool_does_not_queue_requests(self):
+        """With more concurrent callers than workers, requests run at once and queued ones are not hedged."""
+        policy = HedgePolicy(delay=0.05, max_workers=2)
+        barrier = threading.Barrier(8)
+
+        def send():
+            time.sleep(0.2)
+            return self._response()
+
+        def call():
+            barrier.wait()
+            policy.send(send)
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert time.monotonic() - started < 0.5
+        assert policy.stats["requests"] == 8
+        assert policy.stats["hedges_sent"] == 0
+        assert policy.busy_workers == 0
+
+    def test_client_hedges_only_get(self, mock_response):
+        """Only GET requests go through the hedge policy."""
+        client = PassworkClient('https://mock-passwork-api.com', hedge_delay=0.5)
+        client.http_session = MagicMock()
+        client.http_session.request.return_value = mock_response(200, {"id": "1"})
+        client.hedging.send = MagicMock(side_effect=lambda send: send())
+
+        client.call("GET", "/api/v1/items/1")
+        client.call("POST", "/api/v1/items", {"name": "item"})
+
+        assert client.hedging.send.call_count == 1
+
+class TestEndpointPool:
+
+    def test_failing_endpoint_ejected(self):
+        """An endpoint is skipped after consecutive failures."""
+        pool = EndpointPool(["https://a", "https://b"], failure_threshold=2)
+        a, b = pool.endpoints
+
+        pool.record_failure(a)
+        pool.record_failure(a)
+
+        assert all(pool.select() is b for _ in range(10))
+
+    def test_prefers_lower_latency(self):
+        """With two healthy endpoints the faster one is selected."""
+        pool = EndpointPool(["https://a", "https://b"])
+        a, b = pool.endpoints
+        pool.record_success(a, 0.5)
+        pool.record_success(b, 0.05)
+
+        assert all(pool.select() is b for _ in range(10))
+
+    def test_all_ejected_still_selects(self):
+        """If every endpoint is ejected the earliest to recover is used."""
+        pool = EndpointPool(["https://a"], failure_threshold=1)
+        pool.record_failure(pool.endpoints[0])
+
+        assert pool.select() is pool.endpoints[0]
+
+    def test_failover_on_connection_error(self, mock_response):
+        """A GET that cannot connect is retried on the next host."""
+        client = PassworkClient(['https://a.example.com', 'https://b.example.com'])
+        client.http_session = MagicMock()
+        client.http_session.request.side_effect = [
+            requests.ConnectionError("refused"),
+            mock_response(200, {"id": "1"}),
+        ]
+
+        assert client.call("GET", "/api/v1/items/1") == {"id": "1"}
+
+        urls = [call.args[1] for call in client.http_session.request.call_args_list]
+        assert {urls[0], urls[1]} == {"https://a.example.com/api/v1/items/1", "https://b.example.com/api/v1/items/1"}
+
+    def test_post_not_repeated_after_read_timeout(self):
+        """A POST that may have reached the server is not sent to another host."""
+        client = PassworkClient(['https://a.example.com', 'https://b.example.com'])
+        client.http_session = MagicMock()
+        client.http_session.request.side_effect = requests.ReadTimeout()
+
+        with pytest.raises(PassworkError):
+            client.call("POST", "/api/v1/items", {"name": "item"})
+
+        assert client.http_session.request.call_count == 1
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold(self):
+        """The circuit opens after consecutive failures and rejects requests."""
+        changes = []
+        breaker = CircuitBreaker("https://a", failure_threshold=2, reset_timeout=60,
+                                 on_state_change=lambda *change: changes.append(change))
+
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.Open
+        assert not breaker.allow()
+        assert changes == [("https://a", CircuitState.Closed, CircuitState.Open)]
+
+    def test_half_open_probe(self):
+        """After the cool-down one probe is let through and success closes the circuit."""
+        breaker = CircuitBreaker("https://a", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.allow()
+        assert breaker.state == CircuitState.HalfOpen
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitState.Closed
+
+    def test_half_open_failure_reopens(self):
+        """A failed probe opens the circuit again."""
+        breaker = CircuitBreaker("https://a", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.Open
+
+    def test_open_circuit_fails_fast(self, mock_response):
+        """Once the circuit is open, calls fail without sending requests."""
+        client = PassworkClient('https://mock-passwork-api.com', circuit_failure_threshold=2, circuit_reset_timeout=60)
+        client.http_session = MagicMock()
+        client.http_session.request.side_effect = requests.ConnectionError("refused")
+
+        for _ in range(2):
+            with pytest.raises(requests.ConnectionError):
+                client.call("GET", "/api/v1/vaults")
+
+        with pytest.raises(PassworkError) as e:
+            client.call("GET", "/api/v1/vaults")
+
+        assert e.value.code == "circuit_open"
+        assert client.http_session.request.call_count == 2
+
+    def _half_open_client(self):
+        client = PassworkClient('https://mock-passwork-api.com', circuit_failure_threshold=1, circuit_reset_timeout=0)
+        client.http_session = MagicMock()
+        breaker = client.endpoints.endpoints[0].breaker
+        breaker.record_failure()
+        return client, breaker
+
+    def test_expired_deadline_does_not_take_probe(self, mock_response):
+        """A call whose deadline has passed fails before a half-open circuit lets it through."""
+        client, breaker = self._half_open_client()
+
+        with pytest.raises(PassworkError) as e:
+            client.call("GET", "/api/v1/vaults", deadline=Deadline(0))
+
+        assert e.value.code == "deadline_exceeded"
+        assert not breaker.probe_in_flight
+
+        client.http_session.request.return_value = mock_response(200, {"items": []})
+        assert client.call("GET", "/api/v1/vaults") == {"items": []}
+        assert breaker.state == CircuitState.Closed
+
+    def test_deadline_expiring_in_probe_releases_it(self, mock_response):
+        """A probe that runs out of time before it is sent is released."""
+        client, breaker = self._half_open_client()
+        deadline = MagicMock(spec=Deadline)
+        deadline.expired.return_value = False
+        deadline.check.side_effect = [None, PassworkError("Deadline of 1s exceeded", "deadline_exceeded")]
+
+        with pytest.raises(PassworkError) as e:
+            client.call("GET", "/api/v1/vaults", deadline=deadline)
+
+        assert e.value.code == "deadline_exceeded"
+        assert not breaker.probe_in_flight
+        client.http_session.request.return_value = mock_response(200, {"items": []})
+        assert client.call("GET", "/api/v1/vaults") == {"items": []}
+
+    def test_unexpected_error_releases_probe(self, mock_response):
+        """A probe failing with an error other than a connection error or timeout is released."""
+        client, breaker = self._half_open_client()
+        client.http_session.request.side_effect = requests.exceptions.ChunkedEncodingError("broken")
+
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            client.call("GET", "/api/v1/vaults")
+
+        assert breaker.state == CircuitState.Open
+        assert not breaker.probe_in_flight
+        client.http_session.request.side_effect = None
+        client.http_session.request.return_value = mock_response(200, {"items": []})
+        assert client.call("GET", "/api/v1/vaults") == {"items": []}
+
+    def test_deadline_capped_timeout_not_counted(self):
+        """A timeout shortened to fit the caller's deadline is not blamed on the host."""
+        client = PassworkClient('https://mock-passwork-api.com', read_timeout=10, circuit_failure_threshold=1)
+        client.http_session = MagicMock()
+        client.http_session.request.side_effect = requests.ReadTimeout()
+        endpoint = client.endpoints.endpoints[0]
+
+        with pytest.raises(PassworkError):
+            client.call("GET", "/api/v1/vaults", deadline=0.05)
+
+        assert endpoint.failures == 0
+        assert endpoint.breaker.state == CircuitState.Closed
+
+    def test_transport_timeout_counted(self):
+        """A timeout at the client-wide timeout counts as a failure of the host."""
+        client = PassworkClient('https://mock-passwork-api.com', read_timeout=0.01, circuit_failure_threshold=1)
+        client.http_session = MagicMock()
+        client.http_session.request.side_effect = requests.ReadTimeout()
+
+        with pytest.raises(PassworkError):
+            client.call("GET", "/api/v1/vaults", deadline=5)
+
+        assert client.endpoints.endpoints[0].breaker.state == CircuitState.Open
+
+    def test_interrupt_releases_probe_without_failure(self):
+        """A probe interrupted by the caller is released without being counted against the host."""
+        client, breaker = self._half_open_client()
+        client.http_session.request.side_effect = KeyboardInterrupt()
+
+        with pytest.raises(KeyboardInterrupt):
+            client.call("GET", "/api/v1/vaults")
+
+        assert breaker.state == CircuitState.HalfOpen
+        assert breaker.failures == 1
+        assert not breaker.probe_in_flight
+
+    def test_hedging_error_releases_probe(self, mock_response):
+        """A probe failing inside the hedge policy is released."""
+        client = PassworkClient('https://mock-passwork-api.com', hedge_delay=0.5,
+                                circuit_failure_threshold=1, circuit_reset_timeout=0)
+        client.http_session = MagicMock()
+        breaker = client.endpoints.endpoints[0].breaker
+        breaker.record_failure()
+        client.hedging.send = MagicMock(side_effect=RuntimeError("hedge failed"))
+
+        with pytest.raises(RuntimeError):
+            client.call("GET", "/api/v1/vaults")
+
+        assert not breaker.probe_in_flight
+        assert breaker.allow()
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_coalesced(self):
+        """Concurrent calls for the same key run once and get independent copies."""
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(2)
+            return {"customs": [{"name": "a"}]}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("key", fetch)))
+        leader.start()
+        started.wait(2)
+        followers = [threading.Thread(target=lambda: results.append(flight.do("key", fetch))) for _ in range(3)]
+        for follower in followers:
+            follower.start()
+        while flight.calls["key"].followers < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(2)
+
+        assert len(calls) == 1
+        assert len(results) == 4
+        assert all(result == {"customs": [{"name": "a"}]} for result in results)
+        assert len({id(result) for result in results}) == 4
+
+    def test_errors_shared(self):
+        """Followers see the leader's error."""
+        flight = SingleFlight()
+
+        with pytest.raises(PassworkError):
+            flight.do("key", MagicMock(side_effect=PassworkError("failed", "api_error:500")))
+
+        assert flight.calls == {}
+
+    def test_get_item_coalesced(self, mock_response):
+        """Concurrent get_item calls for one ID share the request and decryption."""
+        client = PassworkClient('https://mock-passwork-api.com', coalesce_requests=True)
+        release = threading.Event()
+
+        def request(*args, **kwargs):
+            release.wait(2)
+            return {"id": "1", "passwordEncrypted": "cGFzc3dvcmQ=", "keyEncrypted": None}
+
+        client._request = MagicMock(side_effect=request)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.get_item("1"))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while not client.single_flight.calls or client.single_flight.calls[("get_item", "1")].followers < 4:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(2)
+
+        assert client._request.call_count == 1
+        assert [result["password"] for result in results] == ["password"] * 5
+
+class TestConditionalRequests:
+
+    def test_validators_sent_and_updated(self, mock_response):
+        """Validators are sent as conditional headers and refreshed from the response."""
+        client = PassworkClient('https://mock-passwork-api.com')
+        client.http_session = MagicMock()
+        response = mock_response(200, {"id": "1"})
+        response.headers = {"ETag": '"v2"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+        client.http_session.request.return_value = response
+        validators = {"etag": '"v1"'}
+
+        client.call("GET", "/api/v1/items/1", validators=validators)
+
+        headers = client.http_session.request.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert validators == {"etag": '"v2"', "last_modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+
+    def test_not_modified_response(self, mock_response):
+        """A 304 response is reported without parsing a body."""
+        client = PassworkClient('https://mock-passwork-api.com')
+        client.http_session = MagicMock()
+        response = mock_response(304)
+        response.json.side_effect = ValueError("no body")
+        client.http_session.request.return_value = response
+
+        assert client.call("GET", "/api/v1/items/1", validators={"etag": '"v1"'}) == {"_not_modified": True}
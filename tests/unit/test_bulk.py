@@ -0,0 +1,87 @@
+import pytest
+import requests
+from passwork_client.bulk_journal import BulkJournal
+from passwork_client.exceptions import PassworkError
+
+class TestBulk:
+
+    @pytest.fixture
+    def journal_path(self, tmp_path):
+        return str(tmp_path / "job.journal")
+
+    def _operations(self):
+        return [
+            {"key": "create-1", "action": "create", "data": {"vaultId": "v1", "name": "First"}},
+            {"key": "update-2", "action": "update", "item_id": "2", "data": {"vaultId": "v1", "name": "Second"}},
+            {"key": "delete-3", "action": "delete", "item_id": "3"},
+        ]
+
+    def test_run_bulk_records_operations(self, mock_client, journal_path):
+        """Finished operations are recorded with their server IDs."""
+        mock_client._request.side_effect = [{"id": "1"}, {}, {"binItemId": "bin"}]
+
+        results = list(mock_client.run_bulk(self._operations(), BulkJournal(journal_path)))
+
+        assert [(result["status"], result["id"]) for result in results] == [("done", "1"), ("done", "2"), ("done", "3")]
+        journal = BulkJournal(journal_path)
+        assert journal.is_done("create-1") and journal.get("create-1")["id"] == "1"
+        assert "Idempotency-Key" in mock_client._request.call_args_list[0].kwargs["headers"]
+
+    def test_resume_skips_finished_work(self, mock_client, journal_path):
+        """A restarted job skips done operations and retries failed ones."""
+        mock_client._request.side_effect = [{"id": "1"}, PassworkError("Server error", "api_error:500")]
+        first_run = list(mock_client.run_bulk(self._operations()[:2], BulkJournal(journal_path)))
+        assert [result["status"] for result in first_run] == ["done", "failed"]
+
+        mock_client._request.reset_mock(side_effect=True)
+        mock_client._request.side_effect = [{}, {"binItemId": "bin"}]
+        second_run = list(mock_client.run_bulk(self._operations(), BulkJournal(journal_path)))
+
+        assert [result["status"] for result in second_run] == ["skipped", "done", "done"]
+        assert second_run[0]["id"] == "1"
+        assert mock_client._request.call_count == 2
+
+    def test_pending_create_is_checked_before_resending(self, mock_client, journal_path):
+        """A create sent before a crash is found instead of being created twice."""
+        journal = BulkJournal(journal_path)
+        journal.mark_pending("create-1", "create")
+        mock_client._request.side_effect = [
+            {"items": [{"id": "1", "name": "First", "folderId": None}]},
+            {"id": "1", "vaultId": "v1", "name": "First", "folderId": None, "createdAt": "2099-01-01T00:00:00Z"},
+        ]
+
+        results = list(mock_client.run_bulk(self._operations()[:1], BulkJournal(journal_path)))
+
+        assert results[0]["status"] == "done" and results[0]["id"] == "1"
+        assert mock_client._request.call_count == 2
+        assert mock_client._request.call_args_list[0].args[:2] == ("GET", "/api/v1/items/search")
+
+    def test_pending_create_ignores_older_items(self, mock_client, journal_path):
+        """An item with the same name that predates the job is not taken as the created item."""
+        journal = BulkJournal(journal_path)
+        journal.mark_pending("create-1", "create")
+        mock_client._request.side_effect = [
+            {"items": [{"id": "old", "name": "First", "folderId": None}]},
+            {"id": "old", "vaultId": "v1", "name": "First", "folderId": None, "createdAt": "2020-01-01T00:00:00Z"},
+            {"id": "1"},
+        ]
+
+        results = list(mock_client.run_bulk(self._operations()[:1], BulkJournal(journal_path)))
+
+        assert results[0]["status"] == "done" and results[0]["id"] == "1"
+        assert mock_client._request.call_args.args[:2] == ("POST", "/api/v1/items")
+
+    def test_ambiguous_failure_stays_pending(self, mock_client, journal_path):
+        """A create whose request timed out after it was sent is looked up when the job is resumed."""
+        error = PassworkError("Request timed out", "request_timeout")
+        error.__cause__ = requests.ReadTimeout()
+        mock_client._request.side_effect = [error]
+
+        results = list(mock_client.run_bulk(self._operations()[:1], BulkJournal(journal_path)))
+
+        assert results[0]["status"] == "failed"
+        assert BulkJournal(journal_path).is_pending("create-1")
+
+    def test_idempotency_key_is_stable_across_restarts(self, journal_path):
+        """A reopened journal keeps its job ID and thereby its idempotency keys."""
+        assert BulkJournal(journal_path).idempotency_key("a") == BulkJournal(journal_path).idempotency_key("a")
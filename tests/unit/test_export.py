@@ -0,0 +1,43 @@
+import io
+import csv
+import json
+import pytest
+from unittest.mock import MagicMock
+from passwork_client.exceptions import PassworkError
+
+class TestExport:
+
+    @pytest.fixture
+    def client(self, mock_client):
+        items = [
+            {"id": "1", "name": "DB", "login": "admin", "password": "secret", "passwordEncrypted": "encrypted",
+             "tags": ["prod", "db"], "customs": [{"name": "port", "value": "5432", "type": "text"}]},
+            {"id": "2", "name": "Mail", "password": "other"},
+        ]
+        mock_client.iter_search = MagicMock(return_value=iter(items))
+        return mock_client
+
+    def test_export_jsonl(self, client):
+        """Each item is written as one JSON line without encrypted fields."""
+        output = io.StringIO()
+
+        assert client.export_items(output, vault_ids=["v1"]) == 2
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [record["password"] for record in records] == ["secret", "other"]
+        assert "passwordEncrypted" not in records[0]
+
+    def test_export_csv(self, client):
+        """CSV exports have one row per item with tags and customs flattened."""
+        output = io.StringIO(newline="")
+
+        client.export_items(output, format="csv", vault_ids=["v1"])
+
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        assert rows[0]["tags"] == "prod,db"
+        assert json.loads(rows[0]["customs"])[0]["value"] == "5432"
+        assert rows[1]["login"] == ""
+
+    def test_export_rejects_unknown_format(self, client):
+        with pytest.raises(PassworkError):
+            client.export_items(io.StringIO(), format="xml")
@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from passwork_client.crypto import rsa_encrypt, b64encode, encrypt_aes
+
+class TestInbox:
+
+    @pytest.fixture
+    def client(self, mock_encrypted_client):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        mock_encrypted_client.user_private_key = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        ).decode()
+        mock_encrypted_client.user_public_key = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+        return mock_encrypted_client
+
+    def _inbox_item(self, client, inbox_id, key, password):
+        return {
+            "id": inbox_id,
+            "inbox": {"keyEncrypted": b64encode(rsa_encrypt(key, client.user_public_key)).decode()},
+            "passwordEncrypted": encrypt_aes(password, key),
+            "attachments": [{"id": f"{inbox_id}-a"}],
+        }
+
+    def test_iter_inbox_decrypts_in_batches(self, client):
+        """Inbox items are listed, fetched through batches and decrypted."""
+        first = self._inbox_item(client, "1", "key1", "secret1")
+        second = self._inbox_item(client, "2", "key2", "secret2")
+        client._request.side_effect = [
+            {"items": [{"id": "1"}, {"id": "2"}]},
+            {"responses": [{"statusCode": 200, "body": first}]},
+            {"responses": [{"statusCode": 200, "body": second}]},
+        ]
+
+        inbox_items = list(client.iter_inbox(page_size=1))
+
+        assert [inbox_item["password"] for inbox_item in inbox_items] == ["secret1", "secret2"]
+
+    def test_download_inbox_attachments_reports_failures(self, client, tmp_path):
+        """Attachments are downloaded concurrently into one directory per inbox item."""
+        inbox_items = [self._inbox_item(client, "1", "key1", "a"), self._inbox_item(client, "2", "key2", "b")]
+        client.get_item_attachment = MagicMock(side_effect=lambda item_id, attachment_id, deadline: {"id": attachment_id})
+
+        def save(attachment_data, key, path):
+            if attachment_data["id"] == "2-a":
+                raise Exception("Can't decrypt attachment: hashes are not equal")
+
+        with patch("passwork_client.modules.inbox.decrypt_and_save_item_attachment", side_effect=save) as saved:
+            failed = client.download_inbox_attachments(inbox_items, str(tmp_path))
+
+        assert list(failed) == ["2"]
+        # Downloads run concurrently, in no particular order
+        assert ("key1", str(tmp_path / "1")) in [call.args[1:] for call in saved.call_args_list]
@@ -3,8 +3,9 @@ import json
 import os
 from unittest.mock import patch, MagicMock
 from passwork_client import PassworkClient
-from passwork_client.crypto import decrypt_aes, rsa_decrypt
+from passwork_client.crypto import decrypt_aes, encrypt_aes, rsa_decrypt
 from passwork_client.utils import get_encryption_key
+from passwork_client.item_cache import ItemCache
 
 class TestItem:
     
@@ -43,7 +44,7 @@ class TestItem:
         
         # Verify the method made the correct request
         mock_encrypted_client._request.assert_called_once_with(
-            "GET", f"/api/v1/items/{item_id}"
+            "GET", f"/api/v1/items/{item_id}", deadline=None, params={}
         )
         
         # Expected item object after decryption
@@ -95,4 +96,119 @@ class TestItem:
         assert item['description'] == expected_item['description'], "Description field doesn't match"
         
         # Check that the entire item object matches the expected result
-        assert item == expected_item, "Decrypted item object doesn't match expected value" 
\ No newline at end of file
+        assert item == expected_item, "Decrypted item object doesn't match expected value" 
+
+    def test_iter_search_fetches_pages(self, mock_client):
+        """iter_search fetches and yields search results page by page."""
+        mock_client._request.return_value = {"items": [{"id": str(i)} for i in range(5)]}
+        mock_client.send_batch = MagicMock(side_effect=lambda requests, deadline: [
+            {"id": request["relativeUrl"].rsplit("/", 1)[1]} for request in requests
+        ])
+
+        items = mock_client.iter_search(vault_ids=["v1"], page_size=2)
+        assert next(items)["id"] == "0"
+
+        assert [item["id"] for item in items] == ["1", "2", "3", "4"]
+        assert [len(call.args[0]) for call in mock_client.send_batch.call_args_list] == [2, 2, 1]
+
+    def test_search_items_sharded_merges_shards(self, mock_client):
+        """Large vault filters are searched in shards and the results de-duplicated."""
+        def search(method, endpoint, deadline=None, params=None):
+            return {"items": [{"id": "shared"}] + [{"id": vault_id} for vault_id in params["vaultIds[]"]]}
+        mock_client._request.side_effect = search
+
+        results = mock_client.search_items_sharded(vault_ids=["v1", "v2", "v3", "v4", "v5"], shard_size=2)
+
+        assert sorted(result["id"] for result in results) == ["shared", "v1", "v2", "v3", "v4", "v5"]
+        assert mock_client._request.call_count == 3
+
+    def test_create_items_streams_results(self, mock_encrypted_client):
+        """create_items encrypts with cached vault keys, creates in batches and reports per-item errors."""
+        mock_encrypted_client.vault_keys["v1"] = "vault_key"
+        mock_encrypted_client._request.side_effect = [
+            {"responses": [{"statusCode": 200, "body": {"id": "id1"}},
+                           {"statusCode": 400, "body": {"errors": [{"field": "name", "message": "Too long"}]}}]},
+            {"responses": [{"statusCode": 200, "body": {"id": "id4"}}]},
+        ]
+        items = [
+            {"vaultId": "v1", "name": "First", "password": "secret"},
+            {"vaultId": "v1", "name": "x" * 1000},
+            {"vaultId": "v1", "name": "Invalid", "customs": [{"name": "otp", "value": "bad", "type": "totp"}]},
+            {"vaultId": "v1", "name": "Fourth"},
+        ]
+
+        results = list(mock_encrypted_client.create_items(iter(items), chunk_size=3))
+
+        assert [(result["index"], result["id"]) for result in results] == [(0, "id1"), (1, None), (2, None), (3, "id4")]
+        assert results[1]["error"].code == "api_error:400"
+        assert results[2]["error"] is not None
+        first_batch = mock_encrypted_client._request.call_args_list[0].kwargs["json"]["requests"]
+        assert len(first_batch) == 2
+        assert decrypt_aes(first_batch[0]["body"]["passwordEncrypted"], "vault_key") == "secret"
+
+    def test_create_items_reports_missing_responses(self, mock_encrypted_client):
+        """Items left without a sub-response are reported as failed, not as created."""
+        mock_encrypted_client.vault_keys["v1"] = "vault_key"
+        mock_encrypted_client._request.return_value = {"responses": [{"statusCode": 200, "body": {"id": "id1"}}]}
+
+        results = list(mock_encrypted_client.create_items([{"vaultId": "v1", "name": "First"}, {"vaultId": "v1", "name": "Second"}]))
+
+        assert results[0]["id"] == "id1" and results[0]["error"] is None
+        assert results[1]["id"] is None and results[1]["error"].code == "missing_batch_response"
+
+    def test_create_items_splits_chunks_into_batches(self, mock_encrypted_client):
+        """Chunks larger than the batch size are sent as several batch requests."""
+        mock_encrypted_client.vault_keys["v1"] = "vault_key"
+        mock_encrypted_client._request.side_effect = lambda *args, **kwargs: {"responses": [
+            {"statusCode": 200, "body": {"id": request["body"]["name"]}} for request in kwargs["json"]["requests"]
+        ]}
+        items = [{"vaultId": "v1", "name": str(i)} for i in range(30)]
+
+        results = list(mock_encrypted_client.create_items(items, chunk_size=30))
+
+        assert [result["id"] for result in results] == [str(i) for i in range(30)]
+        batches = [call.kwargs["json"]["requests"] for call in mock_encrypted_client._request.call_args_list]
+        assert [len(batch) for batch in batches] == [25, 5]
+
+    def test_partial_update_sends_only_changes(self, mock_encrypted_client):
+        """A partial update encrypts and sends only changed fields, keeping attachments by reference."""
+        client = mock_encrypted_client
+        client.vault_keys["v1"] = "vault_key"
+        current = {
+            "id": "1", "vaultId": "v1", "vaultMasterKeyEncrypted": "unused", "keyEncrypted": encrypt_aes("item_key", "vault_key"),
+            "name": "DB", "password": "secret", "tags": ["prod"],
+            "customs": [{"name": "port", "type": "text", "value": "5432"}],
+            "attachments": [{"id": "a1", "name": "cert.pem"}],
+        }
+        client._get_item = MagicMock(return_value=current)
+
+        client.update_item("1", {
+            "vaultId": "v1", "name": "DB", "password": "rotated", "tags": ["prod", "db"],
+            "customs": [{"name": "port", "type": "text", "value": "5432"}],
+            "attachments": [{"id": "a1", "name": "cert.pem"}],
+        }, partial=True)
+
+        payload = client._request.call_args.kwargs["json"]
+        assert set(payload) == {"tags", "passwordEncrypted"}
+        assert decrypt_aes(payload["passwordEncrypted"], "item_key") == "rotated"
+
+        client._request.reset_mock()
+        client.update_item("1", {"name": "DB", "attachments": [{"id": "a1"}]}, partial=True)
+        client._request.assert_not_called()
+
+    def test_partial_update_ignores_stale_cache(self, mock_encrypted_client):
+        """A partial update is diffed against the server's copy, not a stale cached one."""
+        client = mock_encrypted_client
+        client.vault_keys["v1"] = "vault_key"
+        client.item_cache = ItemCache(ttl=60)
+        client.item_cache.set("1", {"id": "1", "vaultId": "v1", "name": "DB", "password": "old"})
+        client._request.side_effect = [
+            {"id": "1", "vaultId": "v1", "vaultMasterKeyEncrypted": "unused", "name": "DB",
+             "keyEncrypted": encrypt_aes("item_key", "vault_key"), "passwordEncrypted": encrypt_aes("new", "item_key")},
+            {},
+        ]
+
+        client.update_item("1", {"password": "old"}, partial=True)
+
+        payload = client._request.call_args.kwargs["json"]
+        assert decrypt_aes(payload["passwordEncrypted"], "item_key") == "old"
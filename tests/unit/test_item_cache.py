@@ -0,0 +1,165 @@
+import pytest
+from unittest.mock import MagicMock
+from passwork_client.item_cache import ItemCache
+
+class TestItemCache:
+
+    @pytest.fixture
+    def item(self):
+        return {"id": "1", "name": "db", "passwordEncrypted": "cGFzc3dvcmQ=", "customs": []}
+
+    @pytest.fixture
+    def cached_client(self, mock_client):
+        mock_client.item_cache = ItemCache(ttl=60)
+        return mock_client
+
+    def test_hit_returns_copy(self, item):
+        """Cached values are copies, so callers cannot corrupt the cache."""
+        cache = ItemCache()
+        cache.set("1", item)
+
+        value, is_stale = cache.get("1")
+        value["name"] = "changed"
+
+        assert not is_stale
+        assert cache.get("1")[0]["name"] == "db"
+        assert cache.stats["hits"] == 2
+
+    def test_expired_entry_missed(self, item):
+        """Entries past their TTL are dropped."""
+        cache = ItemCache(ttl=0)
+        cache.set("1", item)
+
+        assert cache.get("1") == (None, False)
+        assert cache.stats["misses"] == 1
+
+    def test_stale_while_revalidate(self, item):
+        """Expired entries are served as stale within the revalidation window."""
+        cache = ItemCache(ttl=0, stale_while_revalidate=60)
+        cache.set("1", item)
+
+        value, is_stale = cache.get("1")
+
+        assert value == item
+        assert is_stale
+        assert cache.stats["stale_hits"] == 1
+
+    def test_lru_eviction_by_count(self, item):
+        """The least recently used entry is evicted first."""
+        cache = ItemCache(max_entries=2)
+        for key in ("1", "2"):
+            cache.set(key, item)
+        cache.get("1")
+        cache.set("3", item)
+
+        assert cache.get("2") == (None, False)
+        assert cache.get("1")[0] is not None
+        assert cache.stats["evictions"] == 1
+
+    def test_eviction_by_bytes(self, item):
+        """The byte budget bounds the cache size."""
+        cache = ItemCache(max_bytes=150)
+        cache.set("1", item)
+        cache.set("2", item)
+
+        assert cache.stats["entries"] == 1
+        assert cache.stats["bytes"] <= 150
+
+    def test_get_item_uses_cache(self, cached_client, item):
+        """A second get_item is served from the cache without a request."""
+        cached_client._request.return_value = item
+
+        first = cached_client.get_item("1")
+        second = cached_client.get_item("1")
+
+        assert first == second
+        assert second["password"] == "password"
+        cached_client._request.assert_called_once()
+
+    def test_update_and_delete_invalidate(self, cached_client, item):
+        """Writes drop the cached item."""
+        cached_client.item_cache.set("1", item)
+        cached_client._request.return_value = {"binItemId": "bin"}
+
+        cached_client.delete_item("1")
+
+        assert cached_client.item_cache.get("1") == (None, False)
+        assert cached_client.item_cache.stats["invalidations"] == 1
+
+    def test_get_items_fetches_only_misses(self, cached_client, item):
+        """Batch fetches skip items that are already cached."""
+        cached_client.item_cache.set("1", {**item, "password": "password"})
+        cached_client.send_batch = MagicMock(return_value=[{**item, "id": "2"}])
+
+        items = cached_client.get_items(["1", "2"])
+
+        assert sorted(i["id"] for i in items) == ["1", "2"]
+        requests = cached_client.send_batch.call_args.args[0]
+        assert [r["relativeUrl"] for r in requests] == ["/api/v1/items/2"]
+
+    def test_get_items_keeps_input_order(self, cached_client, item):
+        """Cached and fetched items come back in the order of the requested IDs."""
+        cached_client.item_cache.set("2", {**item, "id": "2", "password": "password"})
+        cached_client.send_batch = MagicMock(return_value=[{**item, "id": "3"}, {**item, "id": "1"}])
+
+        items = cached_client.get_items(["1", "2", "3"])
+
+        assert [i["id"] for i in items] == ["1", "2", "3"]
+
+    def test_stale_entry_refreshed_in_background(self, mock_client, item):
+        """A stale hit is served immediately and refreshed in the background."""
+        mock_client.item_cache = ItemCache(ttl=0, stale_while_revalidate=60)
+        mock_client.item_cache.set("1", {**item, "name": "old"})
+        mock_client.send_batch = MagicMock(return_value=[{**item, "name": "new", "updatedAt": "2"}])
+
+        assert mock_client.get_item("1")["name"] == "old"
+
+        mock_client.item_cache.refresh_executor.shutdown(wait=True)
+        mock_client.send_batch.assert_called_once()
+        assert mock_client.item_cache.peek("1")[0]["name"] == "new"
+        assert not mock_client.item_cache.refreshing
+
+    def test_stale_entries_refreshed_in_one_batch(self, mock_client, item):
+        """Stale items of get_items are refreshed together, and entries already refreshing are skipped."""
+        mock_client.item_cache = ItemCache(ttl=0, stale_while_revalidate=60)
+        for id in ("1", "2", "3"):
+            mock_client.item_cache.set(id, {**item, "id": id})
+        mock_client.item_cache.start_refresh("3")
+        mock_client.send_batch = MagicMock(return_value=[{**item, "id": "1", "updatedAt": "2"}])
+
+        items = mock_client.get_items(["1", "2", "3"])
+
+        mock_client.item_cache.refresh_executor.shutdown(wait=True)
+        assert [i["id"] for i in items] == ["1", "2", "3"]
+        requests = mock_client.send_batch.call_args.args[0]
+        assert [r["relativeUrl"] for r in requests] == ["/api/v1/items/1", "/api/v1/items/2"]
+        # Item 2 was rejected by the server and is no longer served
+        assert mock_client.item_cache.peek("2")[0] is None
+        assert mock_client.item_cache.refreshing == {"3"}
+
+    def test_conditional_request_not_modified(self, mock_client, item):
+        """An expired entry is revalidated and served again on 304 without decryption."""
+        mock_client.item_cache = ItemCache(ttl=0)
+        mock_client.item_cache.set("1", {**item, "password": "cached"}, {"etag": '"v1"'})
+        mock_client._request.return_value = {"_not_modified": True}
+
+        result = mock_client.get_item("1")
+
+        assert result["password"] == "cached"
+        assert mock_client._request.call_args.kwargs["validators"] == {"etag": '"v1"'}
+
+    def test_unchanged_updated_at_reuses_cached_item(self, mock_client, item):
+        """Without validators an unchanged updatedAt skips decryption."""
+        mock_client.item_cache = ItemCache(ttl=0)
+        mock_client.item_cache.set("1", {**item, "updatedAt": "2025-01-01", "password": "cached"})
+        mock_client._request.return_value = {**item, "updatedAt": "2025-01-01"}
+
+        assert mock_client.get_item("1")["password"] == "cached"
+
+    def test_changed_item_decrypted(self, mock_client, item):
+        """A changed item is decrypted and replaces the cached copy."""
+        mock_client.item_cache = ItemCache(ttl=0)
+        mock_client.item_cache.set("1", {**item, "updatedAt": "2025-01-01", "password": "cached"})
+        mock_client._request.return_value = {**item, "updatedAt": "2025-02-01"}
+
+        assert mock_client.get_item("1")["password"] == "password"
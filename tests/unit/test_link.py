@@ -0,0 +1,32 @@
+from unittest.mock import MagicMock
+from passwork_client.crypto import encrypt_aes, decrypt_aes
+from passwork_client.enums.link_type_enum import LinkType
+from passwork_client.enums.link_expiration_time_enum import LinkExpirationTime
+
+class TestLink:
+
+    def test_create_links(self, mock_encrypted_client):
+        """Items and shortcuts are fetched in batches, each link gets its own key, and links are created in one batch."""
+        client = mock_encrypted_client
+        client.vault_keys["v1"] = "vault_key"
+        item = {"id": "i1", "vaultId": "v1", "vaultMasterKeyEncrypted": "unused", "keyEncrypted": encrypt_aes("item_key", "vault_key"),
+                "name": "DB", "login": "admin", "url": "", "description": "", "password": "secret"}
+        client.get_items = MagicMock(return_value=[item])
+        client._request.side_effect = [
+            {"responses": [{"statusCode": 200, "body": {"id": "i1"}}, {"statusCode": 404, "body": {"errors": [{"message": "Not found"}]}}]},
+            {"responses": [{"statusCode": 200, "body": {"url": "https://p/l1"}}, {"statusCode": 200, "body": {"url": "https://p/l2"}}]},
+        ]
+
+        results = client.create_links(LinkType.SingleUse, LinkExpirationTime.Week, item_ids=["i1"], shortcut_ids=["s1", "s2"])
+
+        assert results[0]["url"].startswith("https://p/l1#code=")
+        assert results[1]["url"].startswith("https://p/l2#code=")
+        assert results[2]["url"] is None and results[2]["error"].code == "api_error:404"
+        assert [(r["itemId"], r["shortcutId"]) for r in results] == [("i1", None), ("i1", "s1"), (None, "s2")]
+        client.get_items.assert_called_once_with(["i1"], client.get_items.call_args.args[1])
+
+        links = [request["body"] for request in client._request.call_args.kwargs["json"]["requests"]]
+        assert links[1]["shortcutId"] == "s1"
+        code = results[0]["url"].split("#code=")[1]
+        assert decrypt_aes(links[0]["itemData"]["passwordEncrypted"], code) == "secret"
+        assert links[0]["keyEncrypted"] != links[1]["keyEncrypted"]
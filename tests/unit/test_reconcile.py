@@ -0,0 +1,98 @@
+import pytest
+from passwork_client.exceptions import PassworkError
+
+class TestReconcile:
+
+    @pytest.fixture
+    def current(self):
+        return [
+            {"id": "1", "vaultId": "v1", "folderId": None, "name": "DB", "login": "admin", "password": "secret", "url": "db"},
+            {"id": "2", "vaultId": "v1", "folderId": None, "name": "Mail", "login": "mail", "password": "old"},
+            {"id": "3", "vaultId": "v1", "folderId": None, "name": "Legacy", "password": "x"},
+        ]
+
+    @pytest.fixture
+    def client(self, mock_client, current):
+        def request(method, endpoint, deadline=None, **kwargs):
+            if endpoint == "/api/v1/items/search":
+                return {"items": [{"id": item["id"]} for item in current]}
+            items = {item["id"]: item for item in current}
+            return {"responses": [
+                {"statusCode": 200, "body": dict(items[sub_request["relativeUrl"].rsplit("/", 1)[1]])}
+                for sub_request in kwargs["json"]["requests"]
+            ]}
+
+        mock_client._request.side_effect = request
+        return mock_client
+
+    def _desired(self, prune=False):
+        return {"vaultId": "v1", "prune": prune, "items": [
+            {"name": "DB", "login": "admin", "password": "secret"},
+            {"name": "Mail", "password": "new"},
+            {"name": "API", "password": "token"},
+        ]}
+
+    def test_plan_compares_managed_fields(self, client):
+        """Only items whose managed fields differ are updated; unlisted items are kept unless pruned."""
+        plan = client.plan(self._desired())
+
+        assert [item["name"] for item in plan["create"]] == ["API"]
+        assert [update["id"] for update in plan["update"]] == ["2"]
+        assert plan["delete"] == [] and plan["unchanged"] == 1
+
+        assert client.plan(self._desired(prune=True))["delete"] == [{"id": "3", "name": "Legacy"}]
+
+    def test_apply_batches_changes(self, client):
+        """Creates, updates and deletes are sent as batches; updates carry only changed fields."""
+        plan = client.plan(self._desired(prune=True))
+        client._request.reset_mock()
+        client._request.side_effect = [
+            {"responses": [{"statusCode": 200, "body": {"id": "4"}}]},
+            {"responses": [{"statusCode": 200, "body": {}}, {"statusCode": 200, "body": {"binItemId": "bin"}}]},
+        ]
+
+        result = client.apply(plan)
+
+        assert result == {"created": ["4"], "updated": ["2"], "deleted": ["3"], "failed": {}}
+        assert client._request.call_count == 2
+        update, delete = client._request.call_args_list[1].kwargs["json"]["requests"]
+        assert set(update["body"]) == {"passwordEncrypted"}
+        assert delete == {"method": "DELETE", "relativeUrl": "/api/v1/items/3"}
+
+    def test_plan_fails_on_unfetched_items(self, client):
+        """An item that cannot be fetched fails the plan instead of being planned as a create."""
+        client._request.side_effect = [
+            {"items": [{"id": "1"}, {"id": "2"}]},
+            {"responses": [{"statusCode": 200, "body": {"id": "1", "name": "DB"}},
+                           {"statusCode": 429, "body": {"errors": [{"message": "Too many requests"}]}}]},
+        ]
+
+        with pytest.raises(PassworkError) as e:
+            client.plan(self._desired())
+
+        assert e.value.code == "plan_fetch_failed"
+
+    def test_plan_fails_on_duplicate_current_items(self, client, current):
+        """Items of the vault sharing a folder and name are reported, not shadowed."""
+        current.append({"id": "5", "vaultId": "v1", "folderId": None, "name": "DB", "password": "other"})
+
+        with pytest.raises(PassworkError) as e:
+            client.plan(self._desired())
+
+        assert e.value.code == "duplicate_current_item"
+
+    def test_apply_failures_keyed_by_item(self, client):
+        """Failures of same-named items in different folders are reported separately."""
+        plan = {"vaultId": "v1", "unchanged": 0, "create": [
+            {"name": "DB", "folderId": "f1", "vaultId": "v1"},
+            {"name": "DB", "folderId": "f2", "vaultId": "v1"},
+        ], "update": [], "delete": [{"id": "3", "name": "DB"}]}
+        client._request.side_effect = [
+            {"responses": [{"statusCode": 400, "body": {"errors": [{"message": "Invalid"}]}},
+                           {"statusCode": 500, "body": {"errors": [{"message": "Failed"}]}}]},
+            {"responses": [{"statusCode": 404, "body": {"errors": [{"message": "Not found"}]}}]},
+        ]
+
+        result = client.apply(plan)
+
+        assert set(result["failed"]) == {0, 1, "3"}
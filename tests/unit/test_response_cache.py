@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import pytest
+from passwork_client.response_cache import ResponseCache
+
+class TestResponseCache:
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl=60)
+        cache.bind(lambda: "access_token:master_key")
+        return cache
+
+    def test_roundtrip(self, cache):
+        """Values survive a new cache instance on the same file."""
+        cache.set("item:1", {"id": "1", "password": "secret"})
+
+        other = ResponseCache(cache.path)
+        other.bind(lambda: "access_token:master_key")
+
+        assert other.get("item:1") == {"id": "1", "password": "secret"}
+
+    def test_encrypted_at_rest(self, cache):
+        """Neither the key nor the value is stored in plain text."""
+        cache.set("item:1", {"password": "secret"})
+
+        with sqlite3.connect(cache.path) as connection:
+            key, value = connection.execute("SELECT key, value FROM entries").fetchone()
+
+        assert "item:1" not in key
+        assert "secret" not in value
+
+    def test_other_session_misses(self, cache):
+        """Entries of another session cannot be read."""
+        cache.set("item:1", {"id": "1"})
+        cache.bind(lambda: "other_token:master_key")
+
+        assert cache.get("item:1") is None
+
+    def test_no_session_disables_cache(self, cache):
+        """Without a session secret nothing is cached."""
+        cache.bind(lambda: None)
+        cache.set("item:1", {"id": "1"})
+
+        assert cache.get("item:1") is None
+
+    def test_expired_entry_missed(self, tmp_path):
+        """Entries expire after the TTL."""
+        cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl=0)
+        cache.bind(lambda: "secret")
+        cache.set("item:1", {"id": "1"})
+
+        assert cache.get("item:1") is None
+
+    def test_size_cap(self, tmp_path):
+        """The least recently used entries are removed above the size cap."""
+        cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_bytes=1000)
+        cache.bind(lambda: "secret")
+        for i in range(10):
+            cache.set(f"item:{i}", {"id": str(i), "description": "x" * 100})
+
+        assert cache.get("item:0") is None
+        assert cache.get("item:9") == {"id": "9", "description": "x" * 100}
+
+    def test_file_permissions(self, cache):
+        """The cache file is only readable by its owner."""
+        assert os.stat(cache.path).st_mode & 0o777 == 0o600
+
+    def test_get_item_served_from_cache(self, mock_client, cache):
+        """A cached item is returned without a request."""
+        cache.bind(mock_client.get_session_secret)
+        mock_client.set_tokens("access_token", None)
+        mock_client.response_cache = cache
+        mock_client._request.return_value = {"id": "1", "passwordEncrypted": "cGFzc3dvcmQ="}
+
+        mock_client.get_item("1")
+        item = mock_client.get_item("1")
+
+        assert item["password"] == "password"
+        mock_client._request.assert_called_once()
+
+    def test_writes_invalidate_cached_searches(self, mock_client, cache):
+        """Search results cached before a write are not served after it."""
+        cache.bind(mock_client.get_session_secret)
+        mock_client.set_tokens("access_token", None)
+        mock_client.response_cache = cache
+        mock_client._request.side_effect = [
+            {"items": [{"id": "1"}]},
+            {"binItemId": "bin"},
+            {"items": []},
+        ]
+
+        assert mock_client.search_items(query="db") == [{"id": "1"}]
+        assert mock_client.search_items(query="db") == [{"id": "1"}]
+        mock_client.delete_item("1")
+
+        assert mock_client.search_items(query="db") == []
+        assert mock_client._request.call_count == 3
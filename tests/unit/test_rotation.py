@@ -0,0 +1,53 @@
+from unittest.mock import MagicMock
+from passwork_client.crypto import decrypt_aes, encrypt_aes
+
+class TestRotation:
+
+    def test_rotate_passwords(self, mock_encrypted_client):
+        """Passwords are encrypted with the item keys and sent in batches; failures and skips are reported."""
+        client = mock_encrypted_client
+        client.vault_keys["v1"] = "vault_key"
+        item = lambda id: {"id": id, "vaultId": "v1", "vaultMasterKeyEncrypted": "unused", "keyEncrypted": encrypt_aes("item_key", "vault_key")}
+        client._request.side_effect = [
+            {"items": [{"id": "1", "updatedAt": "2024-01-01"}, {"id": "2", "updatedAt": "2024-01-01"},
+                       {"id": "3", "updatedAt": "2025-06-01"}]},
+            {"responses": [{"statusCode": 200, "body": item("1")}, {"statusCode": 200, "body": item("2")}]},
+            {"responses": [{"statusCode": 200, "body": {}}, {"statusCode": 403, "body": {"errors": [{"message": "Forbidden"}]}}]},
+        ]
+
+        report = client.rotate_passwords(vault_ids=["v1"], length=20, complexity={"isDigitsRequired": True},
+                                         updated_before="2025-01-01")
+
+        assert report["rotated"] == ["1"]
+        assert list(report["failed"]) == ["2"] and report["failed"]["2"].code == "api_error:403"
+        assert report["skipped"] == ["3"]
+
+        patch = client._request.call_args_list[2].kwargs["json"]["requests"][0]
+        assert patch["method"] == "PATCH" and patch["relativeUrl"] == "/api/v1/items/1"
+        password = decrypt_aes(patch["body"]["passwordEncrypted"], "item_key")
+        assert len(password) == 20 and any(c.isdigit() for c in password)
+
+    def test_rotate_passwords_compares_timestamps_and_splits_batches(self, mock_encrypted_client):
+        """updatedAt is compared as a point in time, and large chunks are sent in several batches."""
+        client = mock_encrypted_client
+        client.vault_keys["v1"] = "vault_key"
+        key_encrypted = encrypt_aes("item_key", "vault_key")
+        client.search_items = MagicMock(return_value=[{"id": str(i), "updatedAt": 1700000000} for i in range(30)] + [
+            {"id": "late", "updatedAt": 1800000000}, {"id": "offset", "updatedAt": "2025-01-01T00:30:00+02:00"},
+        ])
+
+        def respond(*args, **kwargs):
+            return {"responses": [
+                {"statusCode": 200, "body": {} if request["method"] == "PATCH" else
+                 {"id": request["relativeUrl"].rsplit("/", 1)[1], "vaultId": "v1", "vaultMasterKeyEncrypted": "unused",
+                  "keyEncrypted": key_encrypted}}
+                for request in kwargs["json"]["requests"]
+            ]}
+        client._request.side_effect = respond
+
+        report = client.rotate_passwords(updated_before="2025-01-01T00:00:00+01:00", chunk_size=40)
+
+        assert report["skipped"] == ["late"]
+        assert sorted(report["rotated"]) == sorted([str(i) for i in range(30)] + ["offset"])
+        batches = [call.kwargs["json"]["requests"] for call in client._request.call_args_list]
+        assert [len(batch) for batch in batches] == [25, 6, 25, 6]
@@ -0,0 +1,70 @@
+import pytest
+from passwork_client.search_index import SearchIndex
+
+class TestSearchIndex:
+
+    @pytest.fixture
+    def items(self):
+        return [
+            {"id": "1", "name": "Production DB", "login": "admin", "url": "https://db.example.com",
+             "tags": ["prod", "database"], "color": 1, "vaultId": "v1", "folderId": "f1", "password": "p1"},
+            {"id": "2", "name": "Staging DB", "login": "deploy", "url": "https://staging.example.com",
+             "tags": ["staging", "database"], "color": 2, "vaultId": "v1", "folderId": None, "password": "p2"},
+            {"id": "3", "name": "Mail", "login": "postmaster", "url": "https://mail.example.org",
+             "tags": [], "color": None, "vaultId": "v2", "folderId": "f2", "password": "p3"},
+        ]
+
+    @pytest.fixture
+    def index(self, items):
+        return SearchIndex(items)
+
+    def _ids(self, results):
+        return [item["id"] for item in results]
+
+    def test_prefix_query(self, index):
+        """Every query word must prefix-match a word of the name, login, URL or tags."""
+        assert self._ids(index.search("prod")) == ["1"]
+        assert self._ids(index.search("db")) == ["1", "2"]
+        assert self._ids(index.search("staging dep")) == ["2"]
+        assert self._ids(index.search("post")) == ["3"]
+        assert index.search("nothing") == []
+
+    def test_filters(self, index):
+        """Tag, colour, vault, folder and URL filters narrow the results."""
+        assert self._ids(index.search(tags=["database"])) == ["1", "2"]
+        assert self._ids(index.search(tags=["database"], color_codes=[2])) == ["2"]
+        assert self._ids(index.search(vault_ids=["v2"])) == ["3"]
+        assert self._ids(index.search(folder_ids=["f1", "f2"])) == ["3", "1"]
+        assert self._ids(index.search(url="example.org")) == ["3"]
+
+    def test_incremental_updates(self, index):
+        """Added, updated and removed items are reflected in the results."""
+        index.add({"id": "4", "name": "Redis", "tags": ["cache"], "vaultId": "v2"})
+        index.update("1", {"name": "Primary DB"})
+        index.remove("2")
+
+        assert self._ids(index.search("redis")) == ["4"]
+        assert self._ids(index.search("production")) == []
+        assert self._ids(index.search("primary")) == ["1"]
+        assert self._ids(index.search(tags=["staging"])) == []
+        assert len(index) == 3
+
+    def test_results_are_copies(self, index):
+        """Modifying results does not change the index."""
+        index.search("mail")[0]["name"] = "changed"
+
+        assert index.search("mail")[0]["name"] == "Mail"
+
+    def test_client_keeps_index_current(self, mock_client, items):
+        """create_item, update_item and delete_item update an attached index."""
+        mock_client.build_search_index(items=items)
+        mock_client._request.side_effect = [{"id": "4"}, {}, {"binItemId": "bin"}]
+
+        mock_client.create_item({"vaultId": "v1", "name": "New API key", "password": "secret"})
+        mock_client.update_item("3", {"vaultId": "v2", "name": "Mailbox"})
+        mock_client.delete_item("2")
+
+        assert self._ids(mock_client.search_index.search("api")) == ["4"]
+        assert mock_client.search_index.search("api")[0]["password"] == "secret"
+        assert self._ids(mock_client.search_index.search("mailbox")) == ["3"]
+        assert "2" not in mock_client.search_index
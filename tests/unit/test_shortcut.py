@@ -0,0 +1,58 @@
+import base64
+from unittest.mock import MagicMock
+
+class TestShortcut:
+
+    def _item(self, item_id):
+        return {"id": item_id, "name": f"Item {item_id}", "passwordEncrypted": base64.b64encode(b"secret").decode()}
+
+    def test_search_and_decrypt_shortcut_uses_one_round_trip(self, mock_client):
+        """Shortcuts and their items, known from the search results, share one batch."""
+        mock_client._request.side_effect = [
+            {"items": [{"id": "i1", "shortcut": {"id": "s1"}}, {"id": "i2", "shortcut": {"id": "s2"}}]},
+            {"responses": [
+                {"statusCode": 200, "body": {"id": "i1", "shortcut": {"id": "s1"}}},
+                {"statusCode": 200, "body": self._item("i1")},
+                {"statusCode": 200, "body": {"id": "i2", "shortcut": {"id": "s2"}}},
+                {"statusCode": 200, "body": self._item("i2")},
+            ]},
+        ]
+
+        shortcuts = mock_client.search_and_decrypt_shortcut(vault_ids=["v1"])
+
+        assert mock_client._request.call_count == 2
+        assert [shortcut["password"]["password"] for shortcut in shortcuts] == ["secret", "secret"]
+        urls = [request["relativeUrl"] for request in mock_client._request.call_args.kwargs["json"]["requests"]]
+        assert urls == ["/api/v1/shortcuts/s1", "/api/v1/items/i1", "/api/v1/shortcuts/s2", "/api/v1/items/i2"]
+
+    def test_get_shortcut_items_attaches_items(self, mock_client):
+        """Items are fetched for each batch of shortcuts and attached to them."""
+        mock_client.send_batch = MagicMock(return_value=[{"id": "i1"}])
+        mock_client.get_items = MagicMock(return_value=[{"id": "i1", "password": "secret"}])
+
+        shortcuts = mock_client.get_shortcut_items(["s1"])
+
+        assert shortcuts == [{"id": "i1", "password": {"id": "i1", "password": "secret"}}]
+
+    def test_create_shortcuts(self, mock_encrypted_client):
+        """Source items are fetched once, item keys re-encrypted per target vault, and failures reported."""
+        from passwork_client.crypto import encrypt_aes, decrypt_aes
+        client = mock_encrypted_client
+        client.vault_keys.update({"source": "source_key", "team": "team_key"})
+        item = {"id": "i1", "vaultId": "source", "vaultMasterKeyEncrypted": "unused", "keyEncrypted": encrypt_aes("item_key", "source_key")}
+        client._request.side_effect = [
+            {"responses": [{"statusCode": 200, "body": item}, {"statusCode": 404, "body": {"errors": [{"message": "Not found"}]}}]},
+            {"responses": [{"statusCode": 200, "body": {"id": "s1"}}, {"statusCode": 200, "body": {"id": "s2"}}]},
+        ]
+
+        results = client.create_shortcuts([
+            {"itemId": "i1", "vaultId": "team"},
+            {"itemId": "i2", "vaultId": "team"},
+            {"itemId": "i1", "vaultId": "team", "folderId": "f1"},
+        ])
+
+        assert [result["id"] for result in results] == ["s1", None, "s2"]
+        assert results[1]["error"].code == "api_error:404"
+        posts = client._request.call_args.kwargs["json"]["requests"]
+        assert [post["body"]["folderId"] for post in posts] == [None, "f1"]
+        assert decrypt_aes(posts[0]["body"]["keyEncrypted"], "team_key") == "item_key"
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import MagicMock
+from passwork_client.vault_replica import VaultReplica
+
+class TestSync:
+
+    @pytest.fixture
+    def replica(self, tmp_path):
+        return VaultReplica(str(tmp_path / "replica"), "replica_key")
+
+    def _summary(self, item_id, updated_at, vault_id="v1"):
+        return {"id": item_id, "updatedAt": updated_at, "vaultId": vault_id}
+
+    def _item(self, item_id, updated_at, vault_id="v1"):
+        return {"id": item_id, "updatedAt": updated_at, "vaultId": vault_id, "name": f"Item {item_id}"}
+
+    def test_first_sync_fetches_everything(self, mock_client, replica):
+        """An empty replica is filled with all items of the vaults."""
+        mock_client._request.return_value = {"items": [self._summary("1", "t1"), self._summary("2", "t1")]}
+        mock_client.send_batch = MagicMock(return_value=[self._item("1", "t1"), self._item("2", "t1")])
+
+        stats = mock_client.sync_vaults(["v1"], replica)
+
+        assert stats == {"added": 2, "updated": 0, "deleted": 0, "unchanged": 0}
+        assert replica.get_item("1")["name"] == "Item 1"
+        assert replica.get_cursor("v1")["items"] == 2
+
+    def test_sync_fetches_only_changes(self, mock_client, replica):
+        """Only added and changed items are fetched; items that are gone are removed."""
+        replica.apply([self._item("1", "t1"), self._item("2", "t1"), self._item("3", "t1")], [], {})
+        mock_client._request.return_value = {"items": [
+            self._summary("1", "t1"), self._summary("2", "t2"), self._summary("4", "t2"),
+        ]}
+        mock_client.send_batch = MagicMock(return_value=[self._item("2", "t2"), self._item("4", "t2")])
+
+        stats = mock_client.sync_vaults(["v1"], replica)
+
+        assert stats == {"added": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+        fetched = [request["relativeUrl"] for request in mock_client.send_batch.call_args[0][0]]
+        assert fetched == ["/api/v1/items/4", "/api/v1/items/2"]
+        assert sorted(item["id"] for item in replica.get_items()) == ["1", "2", "4"]
+        assert replica.get_item("2")["updatedAt"] == "t2"
+
+    def test_unchanged_vault_needs_no_fetch(self, mock_client, replica):
+        """A sync without changes makes no batch request."""
+        replica.apply([self._item("1", "t1")], [], {})
+        mock_client._request.return_value = {"items": [self._summary("1", "t1")]}
+        mock_client.send_batch = MagicMock()
+
+        mock_client.sync_vaults(["v1"], replica)
+
+        mock_client.send_batch.assert_not_called()
+
+    def test_replica_is_persisted_encrypted(self, mock_client, replica, tmp_path):
+        """The replica file is encrypted and can be loaded again with the key."""
+        replica.apply([self._item("1", "t1")], [], {"v1": {"syncedAt": "now", "items": 1}})
+        replica.save()
+
+        with open(replica.path) as file:
+            assert "Item 1" not in file.read()
+
+        loaded = VaultReplica(replica.path, "replica_key")
+        assert loaded.get_item("1")["name"] == "Item 1"
+        assert loaded.get_cursor("v1") == {"syncedAt": "now", "items": 1}
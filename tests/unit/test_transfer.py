@@ -0,0 +1,114 @@
+import pytest
+from passwork_client.crypto import decrypt_aes, encrypt_aes
+
+class TestTransfer:
+
+    @pytest.fixture
+    def client(self, mock_encrypted_client):
+        mock_encrypted_client.vault_keys.update({"source": "source_key", "target": "target_key"})
+        return mock_encrypted_client
+
+    def _item(self, item_id, **fields):
+        return {"id": item_id, "vaultId": "source", "vaultMasterKeyEncrypted": "unused",
+                "keyEncrypted": encrypt_aes(f"key{item_id}", "source_key"), "name": f"Item {item_id}",
+                "passwordEncrypted": encrypt_aes("secret", f"key{item_id}"), **fields}
+
+    def _values(self, data):
+        """All strings of a request body."""
+        if isinstance(data, dict):
+            return [value for item in data.values() for value in self._values(item)]
+        if isinstance(data, list):
+            return [value for item in data for value in self._values(item)]
+        return [data] if isinstance(data, str) else []
+
+    def test_move_items_uses_fresh_item_keys(self, client):
+        """Moved items get a fresh item key; the password is re-encrypted with it."""
+        client._request.side_effect = [
+            {"responses": [{"statusCode": 200, "body": self._item("1")}, {"statusCode": 404, "body": {"errors": [{"message": "Not found"}]}}]},
+            {"responses": [{"statusCode": 200, "body": {}}]},
+        ]
+
+        result = client.move_items(["1", "2"], "target", "folder")
+
+        assert result["moved"] == ["1"]
+        assert result["failed"]["2"].code == "api_error:404"
+        patch = client._request.call_args_list[1].kwargs["json"]["requests"][0]
+        assert patch["method"] == "PATCH" and patch["body"]["vaultId"] == "target"
+        new_key = decrypt_aes(patch["body"]["keyEncrypted"], "target_key")
+        assert new_key != "key1"
+        assert decrypt_aes(patch["body"]["passwordEncrypted"], new_key) == "secret"
+
+    def test_copy_items_reencrypts_attachment_keys(self, client):
+        """Copies reuse encrypted attachment data under re-encrypted attachment keys."""
+        attachment = {"name": "cert.pem", "encryptedKey": encrypt_aes("attachment_key", "key1"),
+                      "encryptedData": "data", "hash": "hash"}
+        client._request.side_effect = [
+            {"responses": [{"statusCode": 200, "body": self._item("1", attachments=[{"id": "a1", "name": "cert.pem"}])}]},
+            attachment,
+            {"responses": [{"statusCode": 200, "body": {"id": "copy1"}}]},
+        ]
+
+        result = client.copy_items(["1"], "target")
+
+        assert result == {"copied": {"1": "copy1"}, "failed": {}}
+        body = client._request.call_args_list[2].kwargs["json"]["requests"][0]["body"]
+        new_key = decrypt_aes(body["keyEncrypted"], "target_key")
+        assert decrypt_aes(body["passwordEncrypted"], new_key) == "secret"
+        assert body["attachments"][0]["encryptedData"] == "data"
+        assert decrypt_aes(body["attachments"][0]["encryptedKey"], new_key) == "attachment_key"
+
+    def test_missing_sub_responses_reported(self, client):
+        """Items the batch response has no sub-response for are reported as failed."""
+        client._request.side_effect = [
+            {"responses": [{"statusCode": 200, "body": self._item("1")}, {"statusCode": 200, "body": self._item("2")}]},
+            {"responses": [{"statusCode": 200, "body": {}}]},
+        ]
+
+        result = client.move_items(["1", "2"], "target")
+
+        assert result["moved"] == ["1"]
+        assert result["failed"]["2"].code == "missing_batch_response"
+
+    def test_large_chunks_split_into_batches(self, client):
+        """Chunks larger than the batch size are fetched and moved in several batch requests."""
+        items = {str(i): self._item(str(i)) for i in range(30)}
+        client._request.side_effect = lambda *args, **kwargs: {"responses": [
+            {"statusCode": 200, "body": items[request["relativeUrl"].rsplit("/", 1)[1]] if request["method"] == "GET" else {}}
+            for request in kwargs["json"]["requests"]
+        ]}
+
+        result = client.move_items(list(items), "target", chunk_size=30)
+
+        assert result == {"moved": list(items), "failed": {}}
+        batches = [call.kwargs["json"]["requests"] for call in client._request.call_args_list]
+        assert [len(batch) for batch in batches] == [25, 5, 25, 5]
+
+    @pytest.mark.parametrize("method", ["move_items", "copy_items"])
+    def test_source_vault_key_not_sent(self, client, method):
+        """The source vault key, used as item key by items created by this client, never reaches the target vault."""
+        customs = [{"name": encrypt_aes("pin", "source_key"), "type": encrypt_aes("password", "source_key"),
+                    "value": encrypt_aes("1234", "source_key")}]
+        attachment = {"name": "cert.pem", "encryptedKey": encrypt_aes("attachment_key", "source_key"),
+                      "encryptedData": "data", "hash": "hash"}
+        item = {**self._item("1", customs=customs, attachments=[{"id": "a1", "name": "cert.pem", "encryptedKey": attachment["encryptedKey"]}]),
+                "keyEncrypted": encrypt_aes("source_key", "source_key"),
+                "passwordEncrypted": encrypt_aes("secret", "source_key")}
+        # Only copies download the attachment
+        downloads = [attachment] if method == "copy_items" else []
+        client._request.side_effect = [
+            {"responses": [{"statusCode": 200, "body": item}]},
+            *downloads,
+            {"responses": [{"statusCode": 200, "body": {"id": "copy1"}}]},
+        ]
+
+        getattr(client, method)(["1"], "target")
+
+        assert client._request.call_count == 2 + len(downloads)
+        body = client._request.call_args_list[-1].kwargs["json"]["requests"][0]["body"]
+        new_key = decrypt_aes(body["keyEncrypted"], "target_key")
+        assert new_key != "source_key"
+        assert "source_key" not in self._values(body)
+        encrypted_values = [body["passwordEncrypted"], body["attachments"][0]["encryptedKey"]]
+        encrypted_values += [body["customs"][0][field] for field in ("name", "type", "value")]
+        decrypted_values = [decrypt_aes(value, new_key) for value in encrypted_values]
+        assert decrypted_values == ["secret", "attachment_key", "pin", "password", "1234"]
@@ -0,0 +1,79 @@
+import pytest
+from unittest.mock import MagicMock
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from passwork_client.crypto import rsa_encrypt, b64encode, encrypt_aes
+
+class TestVault:
+
+    @pytest.fixture
+    def keys(self):
+        """Generate an RSA key pair in the format used by the API."""
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        private_pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        ).decode()
+        public_pem = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+        return private_pem, public_pem
+
+    @pytest.fixture
+    def client(self, mock_encrypted_client, keys):
+        mock_encrypted_client.user_private_key, mock_encrypted_client.user_public_key = keys
+        return mock_encrypted_client
+
+    def _vault(self, vault_id, vault_key, public_key, with_key=True):
+        vault = {"id": vault_id, "name": vault_id}
+        if with_key:
+            vault["masterKeyEncrypted"] = b64encode(rsa_encrypt(vault_key, public_key)).decode()
+        return vault
+
+    def test_warm_up_fills_key_ring(self, client, keys):
+        """warm_up decrypts the keys of listed vaults and batch-fetches incomplete ones."""
+        client._request.return_value = {"items": [
+            self._vault("v1", "key1", keys[1]),
+            self._vault("v2", "key2", keys[1], with_key=False),
+        ]}
+        client.send_batch = MagicMock(return_value=[self._vault("v2", "key2", keys[1])])
+
+        assert sorted(client.warm_up()) == ["v1", "v2"]
+        assert client.vault_keys == {"v1": "key1", "v2": "key2"}
+
+    def test_get_vault_key_uses_key_ring(self, client):
+        """A warm vault key needs no request."""
+        client.vault_keys["v1"] = "key1"
+
+        assert client.get_vault_key("v1") == "key1"
+        client._request.assert_not_called()
+
+    def test_item_key_decrypted_once_per_vault(self, client, keys):
+        """Items of one vault share a single RSA decryption."""
+        vault_key_encrypted = self._vault("v1", "key1", keys[1])["masterKeyEncrypted"]
+        item = {"vaultId": "v1", "vaultMasterKeyEncrypted": vault_key_encrypted, "keyEncrypted": encrypt_aes("item_key", "key1")}
+
+        assert client.get_item_key(item) == "item_key"
+        assert client.vault_keys == {"v1": "key1"}
+
+        item["vaultMasterKeyEncrypted"] = "not decrypted again"
+        assert client.get_item_key(item) == "item_key"
+
+    def test_set_master_key_clears_key_ring(self, client):
+        """Changing the master key drops the key ring."""
+        client.vault_keys["v1"] = "key1"
+
+        client.set_master_key(None)
+
+        assert client.vault_keys == {}
+
+    def test_parsed_private_key_dropped_with_master_key(self, client, keys):
+        """The parsed private key is kept on the client and cleared by set_master_key."""
+        assert client.get_vault_password(self._vault("v1", "key1", keys[1])) == "key1"
+        assert client.parsed_private_key[0] == keys[0]
+
+        client.set_master_key(None)
+
+        assert client.parsed_private_key is None and client.vault_keys == {}